@@ -1,15 +1,38 @@
+import hashlib
+import os
+import time
+
 import streamlit as st
-import joblib
 import numpy as np
-import pandas as pd
-import cv2
-from PIL import Image
+
+# pandas, sklearn and cv2 are imported lazily, only on the paths that need them
+from instrumentation import METRICS_FILE_ENV, METRICS_PORT_ENV, REGISTRY, RunProfiler, serve
+from risk_model import (ALERT_ICONS, FEATURES, HIGH_THRESHOLD, LOW_THRESHOLD, MODEL_PATH, alert_levels,
+                        compact_path_for, file_sha256, load_fast_model, predict_scores)
 
 # -------------------------
 # Page config & common CSS
 # -------------------------
 st.set_page_config(page_title="GeoGuardians - Risk Predictor", layout="wide")
 
+# -------------------------
+# Instrumentation: per-stage latency histograms (see instrumentation.py)
+# -------------------------
+STAGES = REGISTRY.histogram("georoots_stage_seconds", "Time spent in each app stage.", ["stage"])
+MODEL_LOAD_FAILURES = REGISTRY.counter("georoots_model_load_failures_total", "Failed model loads.")
+run_start = time.perf_counter()
+if os.environ.get(METRICS_PORT_ENV):
+    try:
+        serve(os.environ[METRICS_PORT_ENV])
+    except OSError:
+        pass  # another replica on this host already owns the port
+# ?profile=1 captures a cProfile of this one run (one that raised is finished here, on the next run)
+RunProfiler.finish_abandoned()
+profiler = None
+if st.query_params.get("profile") == "1":
+    del st.query_params["profile"]
+    profiler = RunProfiler()
+
 st.markdown(
     """
     <style>
@@ -108,45 +131,98 @@ st.markdown(
 )
 
 # -------------------------
-# Image processing helper
+# Cached HSV cube per image (keyed on image content hash)
 # -------------------------
-def calculate_green_percentage(pil_img, lower_h=35, upper_h=85, lower_s=40, lower_v=40):
+# each cube is a fixed 181x257x257 uint32 table (~46 MiB) plus an RGB and an HSV preview
+# (800 px wide, ~3 MiB for a 4:3 image), so the byte budget fixes the entry count
+HSV_CUBE_CACHE_BYTES = 256 * 2 ** 20
+HSV_CUBE_BYTES = 181 * 257 * 257 * 4 + 2 * 800 * 600 * 3
+HSV_CUBE_ENTRIES = max(1, HSV_CUBE_CACHE_BYTES // HSV_CUBE_BYTES)
+MASK_CACHE_ENTRIES = 64
+
+
+@st.cache_resource(max_entries=HSV_CUBE_ENTRIES, show_spinner="Indexing image colours...")
+def get_hsv_cube(image_digest, tiled, _image_bytes):
     """
-    Input: PIL Image (RGB)
-    Returns: green_percent (0-100 float), mask_rgb (H,W,3), img_rgb (H,W,3)
+    One pass over the image builds an HSVCube; after that any threshold combination is an
+    exact table lookup, so slider moves never reprocess the image.
+    The raw bytes are excluded from the cache key; image_digest stands in for them.
     """
-    img = np.array(pil_img)  # RGB
-    h, w = img.shape[:2]
-    max_width = 800
-    if w > max_width:
-        ratio = max_width / w
-        img = cv2.resize(img, (int(w * ratio), int(h * ratio)), interpolation=cv2.INTER_AREA)
+    from green_index import build_hsv_cube, open_image
+
+    with STAGES.time("image_decode"):
+        img = open_image(_image_bytes)
+        if not tiled:
+            img = img.convert("RGB")  # full-resolution mode decodes tile by tile instead
+    with STAGES.time("green_index_build"):
+        return build_hsv_cube(img, full_resolution=tiled)
+
 
-    # convert to HSV and compute mask
-    bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
-    lower = np.array([lower_h, lower_s, lower_v])
-    upper = np.array([upper_h, 255, 255])
-    mask = cv2.inRange(hsv, lower, upper)
+@st.cache_data(max_entries=MASK_CACHE_ENTRIES, show_spinner=False)
+def cached_mask_preview(image_digest, tiled, lower_h, upper_h, lower_s, lower_v, _cube):
+    return _cube.mask_preview(lower_h, upper_h, lower_s, lower_v)
 
-    green_pixels = int(np.count_nonzero(mask))
-    total_pixels = mask.size if mask.size > 0 else 1
-    green_percent = (green_pixels / total_pixels) * 100.0
 
-    mask_rgb = cv2.cvtColor(mask, cv2.COLOR_GRAY2RGB)
-    img_rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
-    return green_percent, mask_rgb, img_rgb
+@st.cache_resource(max_entries=1, show_spinner=False)
+def get_upload_store():
+    # uploads and their results persist across sessions and restarts; None if the cache dir is unusable
+    from upload_store import UploadStore
+
+    try:
+        return UploadStore()
+    except Exception:
+        return None
 
 # -------------------------
-# Load model (joblib)
+# Load model, once per process (compact NumPy export when present, else the pickle)
 # -------------------------
-MODEL_PATH = "ridge_reg.pkl"
+@st.cache_resource(max_entries=1, show_spinner=False)
+def get_model(path, mtimes):
+    # mtimes are only part of the cache key: a rewritten model file triggers a reload.
+    # Timed in here so cache hits do not count as loads.
+    with STAGES.time("model_load"):
+        return load_fast_model(path)
+
+
+def model_mtimes(path):
+    return tuple(os.path.getmtime(p) if os.path.exists(p) else None for p in (path, compact_path_for(path)))
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def model_sha(path, mtimes):
+    return file_sha256(path)
+
+
 model = None
 model_load_error = None
 try:
-    model = joblib.load(MODEL_PATH)
+    model = get_model(MODEL_PATH, model_mtimes(MODEL_PATH))
 except Exception as e:
     model_load_error = e
+    MODEL_LOAD_FAILURES.inc()
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def get_risk_surface(path, mtimes, _model):
+    # closed form for the linear model; a non-linear model gets its grid built once here
+    from risk_surface import risk_surface_for
+
+    return risk_surface_for(_model)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def get_uncertainty(path, mtimes):
+    # None when risk_uncertainty.py has not been run for this model file (or the model changed since)
+    from risk_uncertainty import load_uncertainty
+
+    return load_uncertainty(path)
+
+
+def uncertainty_mtimes(path):
+    from risk_uncertainty import uncertainty_path_for
+
+    extra = uncertainty_path_for(path)
+    return model_mtimes(path) + (os.path.getmtime(extra) if os.path.exists(extra) else None,)
 
 # -------------------------
 # Main layout: two columns
@@ -178,20 +254,48 @@ with left:
 with right:
     st.subheader("Upload image for Green Index")
     uploaded_file = st.file_uploader("Upload an image (jpg/png)", type=["jpg", "jpeg", "png"])
+    full_resolution = st.checkbox("Full-resolution green index (tiled, for large drone/satellite images)")
+    with st.expander("HSV thresholds"):
+        # sliders commit on release, so the mask preview is only redrawn once the user pauses
+        h_min, h_max = st.slider("Hue range", min_value=0, max_value=179, value=(35, 85))
+        s_min = st.slider("Min saturation", min_value=0, max_value=255, value=40)
+        v_min = st.slider("Min value (brightness)", min_value=0, max_value=255, value=40)
     preview_col1, preview_col2 = st.columns(2)
     preview_image = None
     mask_rgb = None
     green_percent = 0.0
+    upload_store = None
 
     if uploaded_file is not None:
         try:
-            pil_img = Image.open(uploaded_file).convert("RGB")
-            # default HSV thresholds (kept simple to match your original flow)
-            h_min, h_max, s_min, v_min = 35, 85, 40, 40
-
-            green_percent, mask_rgb, preview_image = calculate_green_percentage(
-                pil_img, lower_h=h_min, upper_h=h_max, lower_s=s_min, lower_v=v_min
-            )
+            image_bytes = uploaded_file.getvalue()
+            image_digest = hashlib.sha256(image_bytes).hexdigest()
+            thresholds = (h_min, h_max, s_min, v_min)
+            upload_store = get_upload_store()
+            # a repeated upload (same bytes and thresholds) is served from the store without decoding
+            with STAGES.time("store_lookup"):
+                stored = upload_store.get(image_digest, full_resolution, *thresholds) if upload_store else None
+                if stored is not None:
+                    try:
+                        preview_image = stored.preview_rgb()
+                        mask_rgb = stored.mask_rgb()
+                        green_percent = stored.green_percent
+                    except OSError:
+                        stored = None  # blob evicted by another process since the lookup
+            if stored is None:
+                cube = get_hsv_cube(image_digest, full_resolution, image_bytes)
+                with STAGES.time("green_index_lookup"):
+                    green_percent = cube.green_percentage(*thresholds)
+                preview_image = cube.preview_rgb
+                with STAGES.time("mask_preview"):
+                    mask_rgb = cached_mask_preview(image_digest, full_resolution, *thresholds, cube)
+                if upload_store is not None:
+                    try:
+                        with STAGES.time("store_put"):
+                            upload_store.put(image_bytes, full_resolution, *thresholds, green_percent, mask_rgb,
+                                             preview_image, name=uploaded_file.name, image_digest=image_digest)
+                    except Exception as e:
+                        st.caption(f"Upload not saved to the local store: {e}")
 
             # display metric & images
             st.metric("Vegetation Cover (%)", f"{green_percent:.2f}%")
@@ -218,32 +322,211 @@ with predict_placeholder.container():
         else:
             # active button
             if st.button("Predict Risk"):
-                # Build input dataframe (green_index passed as fraction 0-1)
-                green_index_frac = (green_percent / 100.0) if green_percent is not None else 0.0
-                input_df = pd.DataFrame([{
-                    "slope_angle_deg": float(slope_angle_deg),
-                    "factor_of_safety": float(factor_of_safety),
-                    "green_index": float(green_index_frac),
-                    "rainfall_mm_day": float(rainfall_mm_day),
-                    "pore_pressure_kpa": float(pore_pressure_kpa)
-                }])
+                # Build input row in FEATURES order (green_index passed as fraction 0-1)
+                with STAGES.time("build_input"):
+                    green_index_frac = (green_percent / 100.0) if green_percent is not None else 0.0
+                    input_row = [[
+                        float(slope_angle_deg),
+                        float(factor_of_safety),
+                        float(green_index_frac),
+                        float(rainfall_mm_day),
+                        float(pore_pressure_kpa),
+                    ]]
 
                 # Run prediction
                 try:
-                    pred = model.predict(input_df)[0]
+                    with STAGES.time("predict"):
+                        pred = float(predict_scores(model, input_row)[0])
                     # classification thresholds (as you used previously)
-                    if pred < 0.21:
-                        alert = "🟢 Low"
-                    elif 0.21 < pred <= 0.25:
-                        alert = "🟡 Medium"
-                    else:
-                        alert = "🔴 High"
+                    alert = ALERT_ICONS[alert_levels([pred])[0]]
 
                     # Notification and results
                     st.success(f"✅ Predicted Risk Score: {pred:.4f}")
                     st.warning(f"⚠️ Alert Level: {alert}")
+                    if upload_store is not None:
+                        try:
+                            upload_store.record_prediction(image_digest, full_resolution, *thresholds, input_row[0],
+                                                           pred, alert_levels([pred])[0],
+                                                           model_sha(MODEL_PATH, model_mtimes(MODEL_PATH)))
+                        except Exception as e:
+                            st.caption(f"Prediction not recorded: {e}")
+
+                    uncertainty = get_uncertainty(MODEL_PATH, uncertainty_mtimes(MODEL_PATH))
+                    if uncertainty is not None:
+                        with STAGES.time("predict_interval"):
+                            band = uncertainty.predict(input_row)
+                        st.info(f"90% interval: {band['risk_score_lo'][0]:.4f} – {band['risk_score_hi'][0]:.4f}  |  "
+                                f"P(Low) {band['p_low'][0]:.0%} · P(Medium) {band['p_medium'][0]:.0%} · "
+                                f"P(High) {band['p_high'][0]:.0%}")
 
                 except Exception as e:
                     st.error(f"Prediction failed: {e}")
 
 st.markdown('</div>', unsafe_allow_html=True)
+
+# -------------------------
+# What-if sensitivity around the current inputs
+# -------------------------
+st.markdown('<div class="section">', unsafe_allow_html=True)
+st.subheader("What-if Sensitivity")
+
+if model is None:
+    st.info("Model not loaded, sensitivity curves unavailable.")
+elif not inputs_valid:
+    st.info("Fill all inputs to see how the risk score responds to each one.")
+# on demand, so a default run does not pull in pandas
+elif st.toggle("Show sensitivity curves"):
+    import pandas as pd
+
+    from risk_surface import DEFAULT_ENVELOPE, FEATURE_LABELS, change_to_reach, level_ranges
+
+    surface = get_risk_surface(MODEL_PATH, model_mtimes(MODEL_PATH), model)
+    base = np.array([slope_angle_deg, factor_of_safety, green_percent / 100.0, rainfall_mm_day, pore_pressure_kpa],
+                    dtype=np.float64)
+    st.caption("Other inputs are held at their current values; the green index comes from the uploaded image "
+               "(0 without one).")
+    feature = st.selectbox("Vary", FEATURES, index=FEATURES.index("rainfall_mm_day"),
+                           format_func=FEATURE_LABELS.get)
+    j = FEATURES.index(feature)
+    lo, hi = DEFAULT_ENVELOPE[feature]
+    values = np.linspace(lo, max(hi, base[j]), 200)
+    curve = pd.DataFrame({
+        "Risk score": surface.sweep(base, feature, values),
+        "Medium threshold": LOW_THRESHOLD,
+        "High threshold": HIGH_THRESHOLD,
+    }, index=pd.Index(values, name=FEATURE_LABELS[feature]))
+    st.line_chart(curve)
+
+    for level in ("Medium", "High"):
+        delta = change_to_reach(surface, base, feature, level)
+        if delta is None:
+            st.write(f"No {FEATURE_LABELS[feature].lower()} within the input range reaches {ALERT_ICONS[level]}.")
+        elif delta == 0:
+            st.write(f"Already {ALERT_ICONS[level]} at the current {FEATURE_LABELS[feature].lower()}.")
+        else:
+            st.write(f"{FEATURE_LABELS[feature]} {delta:+.3g} reaches {ALERT_ICONS[level]}.")
+    st.dataframe(pd.DataFrame(level_ranges(surface, base, feature), columns=["Alert level", "From", "To"]),
+                 hide_index=True)
+
+st.markdown('</div>', unsafe_allow_html=True)
+
+# -------------------------
+# Batch scoring panel
+# -------------------------
+st.markdown('<div class="section">', unsafe_allow_html=True)
+st.subheader("Batch Scoring")
+st.caption("Upload a CSV with columns: " + ", ".join(FEATURES))
+batch_file = st.file_uploader("Upload a CSV of slopes", type=["csv"], key="batch_csv")
+
+if batch_file is not None:
+    if model is None:
+        st.error("Model not loaded, batch scoring unavailable.")
+    else:
+        try:
+            import pandas as pd
+
+            from batch_scoring import score_frame
+
+            start = time.perf_counter()
+            scored = score_frame(model, pd.read_csv(batch_file),
+                                 get_uncertainty(MODEL_PATH, uncertainty_mtimes(MODEL_PATH)))
+            elapsed = time.perf_counter() - start
+            rate = len(scored) / elapsed if elapsed > 0 else float("inf")
+            st.success(f"✅ Scored {len(scored)} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+            st.dataframe(scored["alert_level_pred"].value_counts().rename("count"))
+            st.dataframe(scored.head(100), width='stretch')
+            st.download_button("Download scored CSV", scored.to_csv(index=False).encode("utf-8"),
+                               file_name="scored_slopes.csv", mime="text/csv")
+        except Exception as e:
+            st.error(f"Batch scoring failed: {e}")
+
+st.markdown('</div>', unsafe_allow_html=True)
+
+# -------------------------
+# Upload history (index only; masks are memory-mapped when an entry is opened)
+# -------------------------
+st.markdown('<div class="section">', unsafe_allow_html=True)
+st.subheader("Upload History")
+# the store is only opened once the history is asked for
+if st.toggle("Show previous uploads"):
+    history_store = get_upload_store()
+    if history_store is None:
+        st.caption("Upload store unavailable.")
+    else:
+        import pandas as pd
+
+        history = pd.DataFrame(history_store.history(limit=50))
+        if history.empty:
+            st.caption("No uploads stored yet.")
+        else:
+            history["last_used"] = pd.to_datetime(history["last_used"], unit="s")
+            st.dataframe(history.drop(columns=["mask_height", "mask_width"]), width='stretch')
+            stats = history_store.stats()
+            st.caption(f"{stats['results']} stored results, {stats['bytes'] / 2 ** 20:.1f} of "
+                       f"{stats['max_bytes'] / 2 ** 20:.0f} MB used")
+            pick = st.selectbox("Open entry", range(len(history)),
+                                format_func=lambda i: f"{history['name'][i] or history['image_digest'][i][:12]} "
+                                                      f"(H {history['h_min'][i]}-{history['h_max'][i]}, "
+                                                      f"S>={history['s_min'][i]}, V>={history['v_min'][i]})")
+            entry = history.iloc[pick]
+            stored = history_store.get(entry["image_digest"], bool(entry["full_resolution"]), int(entry["h_min"]),
+                                       int(entry["h_max"]), int(entry["s_min"]), int(entry["v_min"]), touch=False)
+            if stored is not None:
+                hist_col1, hist_col2 = st.columns(2)
+                hist_col1.image(stored.preview_rgb(), caption="Original image", width='stretch')
+                hist_col2.image(stored.mask_rgb(), caption=f"Green areas ({stored.green_percent:.2f}%)",
+                                width='stretch')
+st.markdown('</div>', unsafe_allow_html=True)
+
+# -------------------------
+# Regional risk lookup (spatial index over merged_dataset.csv)
+# -------------------------
+SITES_PATH = "merged_dataset.csv"
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def get_spatial_index(path, mtime):
+    from spatial_index import load_or_build
+
+    return load_or_build(path)
+
+
+st.markdown('<div class="section">', unsafe_allow_html=True)
+st.subheader("Regional Risk Lookup")
+spatial_index = None
+# loaded on demand: the site table and BallTree pull in pandas and sklearn
+if st.toggle("Show monitored sites"):
+    try:
+        spatial_index = get_spatial_index(SITES_PATH, os.path.getmtime(SITES_PATH))
+    except Exception as e:
+        st.error(f"Could not load monitored sites: {e}")
+
+if spatial_index is not None:
+    map_col, query_col = st.columns([1.6, 1])
+    with query_col:
+        centre_lat = st.number_input("Centre latitude", min_value=-90.0, max_value=90.0,
+                                     value=-21.64, step=0.01, format="%.4f")
+        centre_lon = st.number_input("Centre longitude", min_value=-180.0, max_value=180.0,
+                                     value=-70.86, step=0.01, format="%.4f")
+        radius_km = st.slider("Radius (km)", min_value=1, max_value=500, value=50)
+        lookup_levels = st.multiselect("Alert levels", ["Low", "Medium", "High"], default=["High"])
+    nearby = spatial_index.within_radius(centre_lat, centre_lon, radius_km,
+                                         alert_level=lookup_levels or None)
+    with map_col:
+        st.map(nearby[["latitude", "longitude"]] if len(nearby) else
+               {"latitude": [centre_lat], "longitude": [centre_lon]})
+    st.caption(f"{len(nearby)} monitored slopes within {radius_km} km")
+    st.dataframe(nearby.head(200), width='stretch')
+
+st.markdown('</div>', unsafe_allow_html=True)
+
+# -------------------------
+# End of run: total time, metrics file, profile
+# -------------------------
+STAGES.observe(time.perf_counter() - run_start, "script_run")
+if os.environ.get(METRICS_FILE_ENV):
+    REGISTRY.write_textfile(os.environ[METRICS_FILE_ENV])
+if profiler is not None:
+    profile_path, profile_text = profiler.finish()
+    with st.expander(f"Profile of this run ({profile_path})"):
+        st.code(profile_text)
@@ -0,0 +1,117 @@
+import argparse
+import os
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from risk_model import FEATURES, MODEL_PATH, alert_levels, load_fast_model, predict_scores
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+# -------------------------
+# Batch scoring helpers
+# -------------------------
+def score_frame(model, df, uncertainty=None):
+    """
+    Input: fitted model, DataFrame containing the FEATURES columns,
+           optional risk_uncertainty.RidgeUncertainty for the same model
+    Returns: copy of df with risk_score_pred and alert_level_pred columns added
+             (plus interval bounds and per-level probabilities with uncertainty)
+    """
+    missing = [c for c in FEATURES if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing model columns: {', '.join(missing)}")
+
+    X = df[FEATURES].to_numpy(dtype=np.float64)
+    scores = predict_scores(model, X)
+    out = df.copy()
+    out["risk_score_pred"] = scores
+    out["alert_level_pred"] = alert_levels(scores)
+    if uncertainty is not None:
+        from risk_uncertainty import UNCERTAINTY_COLUMNS
+
+        pred = uncertainty.predict(X)
+        for column in UNCERTAINTY_COLUMNS:
+            out[column] = pred[column]
+    return out
+
+
+def iter_scored_chunks(model, source, chunk_rows=DEFAULT_CHUNK_ROWS, uncertainty=None, dtype=None):
+    """Yield scored chunks of a CSV path or file-like object."""
+    for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype=dtype):
+        yield score_frame(model, chunk, uncertainty)
+
+
+def parquet_schema(scored):
+    """Arrow schema fixed from the first chunk: float columns stay float64, everything else is text."""
+    import pyarrow as pa
+
+    return pa.schema([(name, pa.float64() if scored[name].dtype.kind == "f" else pa.string())
+                      for name in scored.columns])
+
+
+def score_csv(model, source, out_path, chunk_rows=DEFAULT_CHUNK_ROWS, uncertainty=None):
+    """
+    Score a CSV chunk by chunk and write the result as CSV or Parquet
+    (chosen from the output extension).
+    Returns: (rows scored, elapsed seconds)
+    """
+    as_parquet = out_path.lower().endswith((".parquet", ".pq"))
+    # Parquet needs one schema for every chunk, so per-chunk type inference is off there:
+    # model columns are float64 and passthrough columns are read as text
+    dtype = defaultdict(lambda: str, {c: np.float64 for c in FEATURES}) if as_parquet else None
+    writer = None
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for i, scored in enumerate(iter_scored_chunks(model, source, chunk_rows, uncertainty, dtype)):
+            rows += len(scored)
+            if as_parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                if writer is None:
+                    schema = parquet_schema(scored)
+                    writer = pq.ParquetWriter(out_path, schema)
+                writer.write_table(pa.Table.from_pandas(scored, preserve_index=False).cast(schema))
+            else:
+                scored.to_csv(out_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows, time.perf_counter() - start
+
+
+# -------------------------
+# CLI entry point
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV of slopes with the ridge risk model.")
+    parser.add_argument("input", help="CSV with the five model columns")
+    parser.add_argument("-o", "--output", help="output .csv or .parquet (default: <input>_scored.csv)")
+    parser.add_argument("--model", default=MODEL_PATH, help="path to the model pickle")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="rows per chunk")
+    parser.add_argument("--uncertainty", action="store_true",
+                        help="add 90%% interval bounds and per-level probabilities (run risk_uncertainty.py first)")
+    args = parser.parse_args(argv)
+
+    out_path = args.output or f"{os.path.splitext(args.input)[0]}_scored.csv"
+    model = load_fast_model(args.model)
+    uncertainty = None
+    if args.uncertainty:
+        from risk_uncertainty import load_uncertainty, uncertainty_path_for
+
+        uncertainty = load_uncertainty(args.model)
+        if uncertainty is None:
+            parser.error(f"no intervals for this model at {uncertainty_path_for(args.model)}; "
+                         f"run `python risk_uncertainty.py` first")
+    rows, elapsed = score_csv(model, args.input, out_path, chunk_rows=args.chunk_rows, uncertainty=uncertainty)
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"Scored {rows} rows in {elapsed:.3f}s ({rate:,.0f} rows/s) -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Cold/warm load time and memory of the columnar cache vs plain pd.read_csv.
+
+    python -m benchmarks.bench_data_store merged_dataset.csv --repeat 5
+"""
+import argparse
+import gc
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from data_store import build_cache, load_dataset
+from risk_model import FEATURES
+
+
+def measure(fn, repeat):
+    """Returns: (best seconds, peak traced MiB, result of last call)"""
+    best = float("inf")
+    peak = 0
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return best, peak / 2**20, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv", nargs="?", default="merged_dataset.csv")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    cache_root = tempfile.mkdtemp(prefix="georoots_bench_")
+    try:
+        cases = [
+            ("read_csv (all columns)", lambda: pd.read_csv(args.csv), args.repeat),
+            ("read_csv (5 features)", lambda: pd.read_csv(args.csv, usecols=FEATURES), args.repeat),
+            ("cache build (cold)", lambda: build_cache(args.csv, cache_root), 1),
+            ("cache load (warm, all)", lambda: load_dataset(args.csv, cache_root=cache_root), args.repeat),
+            ("cache load (warm, 5 features)",
+             lambda: load_dataset(args.csv, columns=FEATURES, cache_root=cache_root), args.repeat),
+        ]
+        print(f"{args.csv}")
+        print(f"{'case':<32}{'best s':>10}{'peak MiB':>10}{'frame MiB':>11}")
+        for name, fn, repeat in cases:
+            seconds, peak, result = measure(fn, repeat)
+            frame_mib = result.memory_usage(deep=True).sum() / 2**20 if isinstance(result, pd.DataFrame) else 0.0
+            print(f"{name:<32}{seconds:>10.4f}{peak:>10.1f}{frame_mib:>11.1f}")
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
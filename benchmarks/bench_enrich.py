@@ -0,0 +1,81 @@
+"""
+Enrichment pipeline throughput on a synthetic dataset built by tiling merged_dataset.csv:
+a cold run per worker count, a warm rerun with nothing changed, and a rerun after one
+input column changed in a tenth of the rows.
+
+    python -m benchmarks.bench_enrich --rows 2000000 --workers 1 4
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from enrich import DEFAULT_CHUNK_ROWS, enrich
+
+
+def write_synthetic(path, rows, source="merged_dataset.csv", seed=0):
+    """Tile the source rows with jitter on the measurements, writing in blocks to bound memory."""
+    base = pd.read_csv(source)
+    numeric = [c for c in base.columns if base[c].dtype.kind == "f" and c not in ("latitude", "longitude")]
+    rng = np.random.default_rng(seed)
+    written = 0
+    while written < rows:
+        block = base.iloc[:min(len(base), rows - written)].copy()
+        block[numeric] = block[numeric] * rng.uniform(0.9, 1.1, (len(block), len(numeric)))
+        block.to_csv(path, mode="a" if written else "w", header=not written, index=False)
+        written += len(block)
+
+
+def perturb(path, column, rows):
+    """Rewrite path with `column` changed in its first `rows` rows."""
+    tmp = path + ".tmp"
+    first = True
+    remaining = rows
+    for chunk in pd.read_csv(path, chunksize=DEFAULT_CHUNK_ROWS, float_precision="round_trip"):
+        n = min(remaining, len(chunk))
+        if n:
+            chunk.iloc[:n, chunk.columns.get_loc(column)] += 1.0
+            remaining -= n
+        chunk.to_csv(tmp, mode="w" if first else "a", header=first, index=False)
+        first = False
+    os.replace(tmp, path)
+
+
+def report(label, stats, size_bytes):
+    elapsed = stats["elapsed_s"]
+    print(f"{label:<28}{elapsed:>8.2f}s {stats['rows'] / elapsed:>12,.0f} rows/s {size_bytes / elapsed / 1e6:>8.1f} MB/s"
+          f"   {stats['chunks_written']}/{stats['chunks']} parts rewritten")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "synthetic.csv")
+        out_dir = os.path.join(tmp, "enriched")
+        start = time.perf_counter()
+        write_synthetic(csv_path, args.rows)
+        size = os.path.getsize(csv_path)
+        print(f"{args.rows:,} rows, {size / 1e6:.0f} MB CSV (generated in {time.perf_counter() - start:.1f}s)")
+
+        for workers in dict.fromkeys(args.workers):
+            shutil.rmtree(out_dir, ignore_errors=True)
+            report(f"cold, {workers} worker(s)", enrich(csv_path, out_dir, args.chunk_rows, workers), size)
+        workers = args.workers[-1]
+        report("warm, nothing changed", enrich(csv_path, out_dir, args.chunk_rows, workers), size)
+        perturb(csv_path, "rainfall_mm_day", args.rows // 10)
+        stats = enrich(csv_path, out_dir, args.chunk_rows, workers)
+        report("rainfall changed in 10%", stats, size)
+        print("  recomputed per transform: " + ", ".join(f"{k} {v}" for k, v in stats["recomputed"].items()))
+
+
+if __name__ == "__main__":
+    main()
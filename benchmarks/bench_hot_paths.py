@@ -0,0 +1,181 @@
+"""
+Stage-by-stage timings for the two hot paths in app.py: the green index
+(decode, resize, HSV conversion, masking, counting) and prediction
+(one-row DataFrame construction vs model.predict vs the array path).
+
+    python -m benchmarks.bench_hot_paths -o bench_results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.bench_hot_paths --compare bench_results/old.json bench_results/new.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import cv2
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+from risk_model import FEATURES, MODEL_PATH, load_model, predict_scores
+
+RESOLUTIONS = [(640, 480), (1920, 1080), (4000, 3000)]
+BATCH_SIZES = [1, 10, 1_000, 100_000, 1_000_000]
+MIN_TIME_S = 0.2
+
+
+def time_it(fn, min_time=MIN_TIME_S, max_repeat=1000):
+    """Repeat fn until min_time has elapsed; returns (median, min) seconds per call."""
+    fn()  # warm-up
+    times = []
+    total = 0.0
+    while total < min_time and len(times) < max_repeat:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+    return float(np.median(times)), float(np.min(times))
+
+
+# -------------------------
+# Synthetic inputs
+# -------------------------
+def synthetic_image(width, height, seed=0):
+    """Smooth, vegetation-like RGB noise (pure noise would make JPEG decode unrealistically slow)."""
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, (max(1, height // 16), max(1, width // 16), 3), dtype=np.uint8)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_LINEAR)
+
+
+def encode(img, fmt):
+    buf = io.BytesIO()
+    Image.fromarray(img).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def synthetic_features(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 90, n),
+        rng.uniform(0.3, 3.0, n),
+        rng.uniform(0, 1, n),
+        rng.uniform(0, 200, n),
+        rng.uniform(0, 100, n),
+    ])
+
+
+# -------------------------
+# Benchmarks
+# -------------------------
+def bench_image(results, resolutions, min_time):
+    lower = np.array([35, 40, 40])
+    upper = np.array([85, 255, 255])
+    for width, height in resolutions:
+        img = synthetic_image(width, height)
+        label = f"{width}x{height}"
+        for fmt in ("JPEG", "PNG"):
+            data = encode(img, fmt)
+            results[f"image.decode.{fmt.lower()}[{label}]"] = time_it(
+                lambda: Image.open(io.BytesIO(data)).convert("RGB"), min_time)
+
+        # same steps as calculate_green_percentage
+        results[f"image.to_array[{label}]"] = time_it(lambda: np.array(Image.fromarray(img)), min_time)
+        max_width = 800
+        if width > max_width:
+            size = (max_width, int(height * max_width / width))
+            results[f"image.resize[{label}]"] = time_it(
+                lambda: cv2.resize(img, size, interpolation=cv2.INTER_AREA), min_time)
+            work = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+        else:
+            work = img
+        results[f"image.hsv[{label}]"] = time_it(
+            lambda: cv2.cvtColor(cv2.cvtColor(work, cv2.COLOR_RGB2BGR), cv2.COLOR_BGR2HSV), min_time)
+        hsv = cv2.cvtColor(cv2.cvtColor(work, cv2.COLOR_RGB2BGR), cv2.COLOR_BGR2HSV)
+        results[f"image.mask[{label}]"] = time_it(lambda: cv2.inRange(hsv, lower, upper), min_time)
+        mask = cv2.inRange(hsv, lower, upper)
+        results[f"image.count[{label}]"] = time_it(lambda: np.count_nonzero(mask), min_time)
+        results[f"image.mask_rgb[{label}]"] = time_it(lambda: cv2.cvtColor(mask, cv2.COLOR_GRAY2RGB), min_time)
+
+
+def bench_predict(results, model, batch_sizes, min_time):
+    for n in batch_sizes:
+        X = synthetic_features(n)
+        records = [dict(zip(FEATURES, map(float, row))) for row in X] if n <= 1000 else None
+        if records is not None:
+            # app.py builds a DataFrame from a list of dicts
+            results[f"predict.dataframe_from_records[{n}]"] = time_it(lambda: pd.DataFrame(records), min_time)
+        results[f"predict.dataframe_from_array[{n}]"] = time_it(
+            lambda: pd.DataFrame(X, columns=FEATURES), min_time)
+        df = pd.DataFrame(X, columns=FEATURES)
+        results[f"predict.model_predict[{n}]"] = time_it(lambda: model.predict(df), min_time)
+        results[f"predict.array_scores[{n}]"] = time_it(lambda: predict_scores(model, X), min_time)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path, new_path, threshold=1.10):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{'benchmark':<48}{'old ms':>11}{'new ms':>11}{'ratio':>8}")
+    regressions = 0
+    for name in sorted(set(old["results"]) & set(new["results"])):
+        a = old["results"][name]["median_s"]
+        b = new["results"][name]["median_s"]
+        ratio = b / a if a > 0 else float("inf")
+        flag = "  <-- slower" if ratio > threshold else ""
+        regressions += ratio > threshold
+        print(f"{name:<48}{a * 1000:>11.4f}{b * 1000:>11.4f}{ratio:>8.2f}{flag}")
+    print(f"{old.get('revision')} -> {new.get('revision')}: {regressions} benchmarks slower by >{threshold - 1:.0%}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", default=None, help="write results as JSON")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--min-time", type=float, default=MIN_TIME_S, help="seconds spent per benchmark")
+    parser.add_argument("--quick", action="store_true", help="smallest resolution and batches up to 1k only")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    resolutions = RESOLUTIONS[:1] if args.quick else RESOLUTIONS
+    batch_sizes = [n for n in BATCH_SIZES if n <= 1000] if args.quick else BATCH_SIZES
+    results = {}
+    bench_image(results, resolutions, args.min_time)
+    bench_predict(results, load_model(args.model), batch_sizes, args.min_time)
+
+    print(f"{'benchmark':<48}{'median ms':>12}{'min ms':>12}")
+    for name, (median, best) in results.items():
+        print(f"{name:<48}{median * 1000:>12.4f}{best * 1000:>12.4f}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({
+                "revision": git_revision(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                            "numpy": np.__version__, "pandas": pd.__version__, "opencv": cv2.__version__},
+                "results": {k: {"median_s": m, "min_s": b} for k, (m, b) in results.items()},
+            }, f, indent=2)
+        print(f"-> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Streaming ingestion throughput: a JSONL telemetry file for many locations is tailed, parsed,
+applied to the LocationStore and re-scored (only locations whose model inputs changed).
+
+    python -m benchmarks.bench_sensor_stream --locations 100000 --records 500000
+"""
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+from risk_model import MODEL_PATH, load_fast_model
+from sensor_stream import LineParser, LocationStore, StreamScorer, tail_lines, to_batch
+
+
+def baseline(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = [f"LOC_{i:06d}" for i in range(n)]
+    return ids, {
+        "slope_angle_deg": rng.uniform(10, 70, n),
+        "factor_of_safety": rng.uniform(0.4, 2.5, n),
+        "green_index": rng.uniform(0, 1, n),
+        "rainfall_mm_day": rng.uniform(0, 60, n),
+        "pore_pressure_kpa": rng.uniform(0, 60, n),
+        "displacement_mm": rng.uniform(0, 20, n),
+    }
+
+
+def write_telemetry(path, ids, records, seed=1):
+    """Rainfall / pore pressure / displacement readings for random locations."""
+    rng = np.random.default_rng(seed)
+    loc = rng.integers(0, len(ids), records)
+    rain = rng.gamma(2.0, 15.0, records)
+    pore = rng.uniform(0, 80, records)
+    disp = rng.uniform(0, 30, records)
+    now = time.time()
+    with open(path, "w") as f:
+        for i in range(records):
+            f.write(json.dumps({"location_id": ids[loc[i]], "timestamp": now, "rainfall_mm_day": round(rain[i], 3),
+                                "pore_pressure_kpa": round(pore[i], 3), "displacement_mm": round(disp[i], 3)}) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--locations", type=int, default=100_000)
+    parser.add_argument("--records", type=int, default=500_000)
+    parser.add_argument("--batch-lines", type=int, default=10_000)
+    parser.add_argument("--model", default=MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    model = load_fast_model(args.model)
+    ids, columns = baseline(args.locations)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "telemetry.jsonl")
+        write_telemetry(path, ids, args.records)
+
+        scorer = StreamScorer(model, LocationStore(args.locations))
+        scorer.seed(ids, columns)
+        scorer.records = scorer.events = scorer.rescored = 0
+        line_parser = LineParser("jsonl")
+        parse_s = apply_s = 0.0
+        start = time.perf_counter()
+        for lines in tail_lines(path, follow=False, max_lines=args.batch_lines):
+            t0 = time.perf_counter()
+            batch = to_batch(line_parser.parse(lines))
+            t1 = time.perf_counter()
+            scorer.process(batch)
+            apply_s += time.perf_counter() - t1
+            parse_s += t1 - t0
+        elapsed = time.perf_counter() - start
+
+    print(f"{args.records:,} records over {args.locations:,} locations in {elapsed:.2f}s "
+          f"({args.records / elapsed:,.0f} records/s)")
+    print(f"  parse {parse_s:.2f}s | apply + re-score {apply_s:.2f}s "
+          f"({scorer.rescored:,} rows re-scored, {scorer.events:,} transitions)")
+    print(f"  state arrays {scorer.store.nbytes / 1e6:.1f} MB, peak RSS "
+          f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
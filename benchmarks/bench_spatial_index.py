@@ -0,0 +1,80 @@
+"""
+SlopeIndex queries vs a brute-force pandas haversine filter on synthetic locations.
+
+    python -m benchmarks.bench_spatial_index --points 1000000 --queries 50
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from spatial_index import SlopeIndex, haversine_km
+
+
+def synthetic_locations(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "location_id": np.char.add("SYN_", np.arange(n).astype(str)),
+        "region": pd.Categorical.from_codes(rng.integers(0, 6, n), ["Alps", "Andes", "Chile", "Himalaya", "India", "USA_NW"]),
+        # uniform on the sphere
+        "latitude": np.degrees(np.arcsin(rng.uniform(-1, 1, n))),
+        "longitude": rng.uniform(-180, 180, n),
+        "alert_level": pd.Categorical.from_codes(rng.integers(0, 3, n), ["High", "Low", "Medium"]),
+    })
+
+
+def best_of(fn, queries):
+    times = []
+    for q in queries:
+        start = time.perf_counter()
+        result = fn(*q)
+        times.append(time.perf_counter() - start)
+    return np.median(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--radius-km", type=float, default=5.0)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    df = synthetic_locations(args.points)
+    rng = np.random.default_rng(1)
+    centres = df.sample(args.queries, random_state=1)[["latitude", "longitude"]].to_numpy()
+    centres = centres + rng.normal(0, 0.01, centres.shape)
+    boxes = [(lat - 0.5, lon - 0.5, lat + 0.5, lon + 0.5) for lat, lon in centres]
+
+    start = time.perf_counter()
+    index = SlopeIndex(df)
+    print(f"{args.points:,} synthetic locations, index build {time.perf_counter() - start:.2f}s")
+
+    def brute_radius(lat, lon):
+        d = haversine_km(lat, lon, df["latitude"].to_numpy(), df["longitude"].to_numpy())
+        return df[(d <= args.radius_km) & (df["alert_level"] == "High")]
+
+    def brute_knn(lat, lon):
+        d = haversine_km(lat, lon, df["latitude"].to_numpy(), df["longitude"].to_numpy())
+        return df.iloc[np.argsort(d)[:args.k]]
+
+    def brute_bbox(a, b, c, d):
+        return df[df["latitude"].between(a, c) & df["longitude"].between(b, d) & (df["alert_level"] == "High")]
+
+    cases = [
+        (f"radius {args.radius_km:g} km, High", lambda la, lo: index.within_radius(la, lo, args.radius_km, "High"),
+         brute_radius, centres),
+        (f"{args.k}-nearest", lambda la, lo: index.nearest(la, lo, args.k), brute_knn, centres),
+        ("bbox 1x1 deg, High", lambda *b: index.in_bbox(*b, alert_level="High"), brute_bbox, boxes),
+    ]
+    print(f"{'query':<26}{'index ms':>10}{'brute ms':>10}{'speedup':>9}")
+    for name, indexed, brute, queries in cases:
+        t_index, r_index = best_of(indexed, queries)
+        t_brute, r_brute = best_of(brute, queries)
+        assert set(r_index["location_id"]) == set(r_brute["location_id"]), name
+        print(f"{name:<26}{t_index * 1000:>10.3f}{t_brute * 1000:>10.2f}{t_brute / t_index:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
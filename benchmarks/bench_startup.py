@@ -0,0 +1,66 @@
+"""
+Cold-start cost of the original inference path (pandas + joblib/sklearn unpickle + one-row
+DataFrame predict) vs the compact NumPy export. Each sample runs in a fresh interpreter.
+
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+{imports}
+t1 = time.perf_counter()
+{load}
+t2 = time.perf_counter()
+{predict}
+t3 = time.perf_counter()
+heavy = [m for m in ("pandas", "sklearn", "cv2", "joblib") if m in sys.modules]
+print(json.dumps({{"import_s": t1 - t0, "load_s": t2 - t1, "first_predict_s": t3 - t2, "heavy": heavy}}))
+"""
+
+ROW = "[[30.0, 1.2, 0.5, 12.5, 22.0]]"
+PATHS = {
+    "pickle + DataFrame": PROBE.format(
+        imports="import joblib\nimport pandas as pd",
+        load="model = joblib.load('ridge_reg.pkl')",
+        predict="pred = model.predict(pd.DataFrame({row}, columns=list(model.feature_names_in_)))[0]".format(row=ROW),
+    ),
+    "compact NumPy": PROBE.format(
+        imports="from risk_model import load_fast_model, predict_scores",
+        load="model = load_fast_model('ridge_reg.pkl')",
+        predict=f"pred = predict_scores(model, {ROW})[0]",
+    ),
+}
+
+
+def run_probe(code):
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per path")
+    args = parser.parse_args(argv)
+
+    run_probe(PATHS["pickle + DataFrame"])  # warm the OS file cache for both paths
+    print(f"{'path':<22}{'import ms':>11}{'load ms':>10}{'1st pred ms':>13}{'total ms':>10}  heavy modules")
+    for name, code in PATHS.items():
+        samples = [run_probe(code) for _ in range(args.runs)]
+        med = {k: float(np.median([s[k] for s in samples])) * 1000 for k in ("import_s", "load_s", "first_predict_s")}
+        total = sum(med.values())
+        print(f"{name:<22}{med['import_s']:>11.1f}{med['load_s']:>10.1f}{med['first_predict_s']:>13.2f}"
+              f"{total:>10.1f}  {', '.join(samples[-1]['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
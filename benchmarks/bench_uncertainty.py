@@ -0,0 +1,49 @@
+"""
+Cost of uncertainty-aware scoring (interval + per-level probabilities) against the plain
+predict, on Final_Dataset.csv's feature rows tiled to millions of rows.
+
+    python -m benchmarks.bench_uncertainty --rows 1000000 5000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from risk_model import FEATURES, MODEL_PATH, alert_level_codes, load_fast_model, predict_scores
+from risk_uncertainty import fit
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="Final_Dataset.csv")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    model = load_fast_model(args.model)
+    uncertainty, _, _ = fit(args.data, args.model)
+    base = pd.read_csv(args.data)[FEATURES].to_numpy(dtype=np.float64)
+
+    print(f"{'rows':>10} {'predict':>10} {'+levels':>10} {'uncertainty':>12} {'ratio':>7} {'rows/s':>14}")
+    for rows in args.rows:
+        X = np.resize(base, (rows, base.shape[1]))
+        plain = best_of(lambda: predict_scores(model, X), args.repeat)
+        levels = best_of(lambda: alert_level_codes(predict_scores(model, X)), args.repeat)
+        full = best_of(lambda: uncertainty.predict(X), args.repeat)
+        print(f"{rows:>10,} {plain * 1000:>8.1f}ms {levels * 1000:>8.1f}ms {full * 1000:>10.1f}ms "
+              f"{full / levels:>6.1f}x {rows / full:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
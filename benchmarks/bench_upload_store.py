@@ -0,0 +1,77 @@
+"""
+Upload store: first upload (decode, HSV cube, mask, store) against a repeated upload served
+from the store, plus index-only history queries, on synthetic JPEGs.
+
+    python -m benchmarks.bench_upload_store --images 20 --size 3000x2000
+"""
+import argparse
+import hashlib
+import io
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from green_index import build_hsv_cube_from_bytes
+from upload_store import UploadStore
+
+THRESHOLDS = (35, 85, 40, 40)
+
+
+def synthetic_jpeg(width, height, seed):
+    rng = np.random.default_rng(seed)
+    # smooth colour field plus noise, so the JPEG is photo-sized rather than noise-sized
+    small = rng.integers(0, 255, (height // 50 + 1, width // 50 + 1, 3), dtype=np.uint8)
+    img = Image.fromarray(small).resize((width, height), Image.BILINEAR)
+    noisy = np.asarray(img, dtype=np.int16) + rng.integers(-12, 12, (height, width, 3))
+    buf = io.BytesIO()
+    Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8)).save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--size", default="3000x2000", help="WIDTHxHEIGHT")
+    parser.add_argument("--max-mb", type=float, default=512)
+    args = parser.parse_args(argv)
+    width, height = map(int, args.size.lower().split("x"))
+
+    images = [synthetic_jpeg(width, height, seed) for seed in range(args.images)]
+    with tempfile.TemporaryDirectory() as root:
+        store = UploadStore(root, int(args.max_mb * 1024 * 1024))
+        miss, hit = [], []
+        for data in images:
+            start = time.perf_counter()
+            digest = hashlib.sha256(data).hexdigest()
+            if store.get(digest, False, *THRESHOLDS) is None:
+                cube = build_hsv_cube_from_bytes(data)
+                mask = cube.mask_preview(*THRESHOLDS)
+                store.put(data, False, *THRESHOLDS, cube.green_percentage(*THRESHOLDS), mask, cube.preview_rgb,
+                          image_digest=digest)
+            miss.append(time.perf_counter() - start)
+        for data in images:
+            start = time.perf_counter()
+            stored = store.get(hashlib.sha256(data).hexdigest(), False, *THRESHOLDS)
+            stored.preview_rgb()
+            stored.mask_rgb()
+            hit.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(100):
+            store.history(limit=50)
+        history_ms = (time.perf_counter() - start) * 10
+        stats = store.stats()
+        store.close()
+
+    print(f"{args.images} images {width}x{height}, {np.mean([len(d) for d in images]) / 1e6:.1f} MB each")
+    print(f"first upload    median {np.median(miss) * 1000:8.1f} ms")
+    print(f"repeat upload   median {np.median(hit) * 1000:8.2f} ms  ({np.median(miss) / np.median(hit):.0f}x faster)")
+    print(f"history (50)    mean   {history_ms:8.2f} ms")
+    print(f"store size      {stats['bytes'] / 2 ** 20:.1f} MB, "
+          f"mask blobs {stats['blobs']['mask']['bytes'] / max(stats['blobs']['mask']['count'], 1) / 1024:.0f} KB each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import csv
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp")
+OUTPUT_COLUMNS = ["file", "sha256", "green_percent", "green_index", "error"]
+
+_known_hashes = frozenset()
+
+
+def list_images(paths):
+    """Expand directories into their image files (sorted); plain files are kept as given."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith(IMAGE_EXTENSIONS))
+        else:
+            files.append(path)
+    return files
+
+
+def read_done_hashes(out_path):
+    if not os.path.exists(out_path):
+        return set()
+    with open(out_path, newline="") as f:
+        return {row["sha256"] for row in csv.DictReader(f) if row.get("sha256") and not row.get("error")}
+
+
+# -------------------------
+# Worker side
+# -------------------------
+def _init_worker(known_hashes):
+    import cv2
+
+    global _known_hashes
+    _known_hashes = known_hashes
+    cv2.setNumThreads(1)  # one process per core already; avoid oversubscription
+
+
+def _process_file(args):
+    path, full_resolution = args
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if digest in _known_hashes:
+            return None
+        from green_index import green_percentage_from_bytes
+
+        green_percent, _, _ = green_percentage_from_bytes(data, tiled=full_resolution)
+        return {"file": path, "sha256": digest, "green_percent": green_percent,
+                "green_index": green_percent / 100.0, "error": ""}
+    except Exception as e:
+        return {"file": path, "sha256": "", "green_percent": "", "green_index": "", "error": str(e)}
+
+
+# -------------------------
+# Pipeline
+# -------------------------
+def run(files, out_path, workers=None, skip_done=False, full_resolution=False, chunksize=4):
+    """
+    Compute the green index of every file across a process pool and append rows to out_path.
+    Each worker reads, decodes, converts and counts its own files, so the stages of different
+    files overlap across cores; results are streamed to the CSV as they arrive.
+    Returns: (rows written, files skipped, elapsed seconds)
+    """
+    known = frozenset(read_done_hashes(out_path)) if skip_done else frozenset()
+    write_header = not (skip_done and os.path.exists(out_path))
+    written = skipped = 0
+    start = time.perf_counter()
+    with open(out_path, "a" if not write_header else "w", newline="") as f, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(known,)) as pool:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS)
+        if write_header:
+            writer.writeheader()
+        for row in pool.map(_process_file, ((p, full_resolution) for p in files), chunksize=chunksize):
+            if row is None:
+                skipped += 1
+                continue
+            writer.writerow(row)
+            written += 1
+    return written, skipped, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Green index for a folder or list of images, in parallel.")
+    parser.add_argument("paths", nargs="+", help="image files and/or directories")
+    parser.add_argument("-o", "--output", default="green_index.csv", help="output CSV (file -> green_index)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--skip-done", action="store_true",
+                        help="append to the output and skip images whose content hash is already in it")
+    parser.add_argument("--full-resolution", action="store_true", help="use the tiled full-resolution mode")
+    args = parser.parse_args(argv)
+
+    files = list_images(args.paths)
+    written, skipped, elapsed = run(files, args.output, workers=args.workers, skip_done=args.skip_done,
+                                    full_resolution=args.full_resolution)
+    rate = (written + skipped) / elapsed if elapsed > 0 else float("inf")
+    print(f"Processed {written} images ({skipped} skipped) in {elapsed:.2f}s "
+          f"({rate:,.1f} images/s, {args.workers or os.cpu_count()} workers) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
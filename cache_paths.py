@@ -0,0 +1,3 @@
+# Dependency-free location of the local cache, shared by data_store, upload_store and the app
+# (kept apart from data_store so importing it does not pull in pandas).
+CACHE_DIR = ".georoots_cache"
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from cache_paths import CACHE_DIR
+
+CACHE_FORMAT = 1
+
+# -------------------------
+# Explicit schema for merged_dataset.csv / merged_dataset_enriched_v2.csv
+# -------------------------
+CATEGORICAL_COLUMNS = [
+    "location_id", "region", "dem_source", "surface_roughness", "habitat", "reinforcement_type",
+    "truck_activity", "alert_level", "rockfall_event", "data_conflict",
+]
+# coordinates need float64; every other measurement fits comfortably in float32
+FLOAT64_COLUMNS = ["latitude", "longitude"]
+DATASET_DTYPES = {c: "category" for c in CATEGORICAL_COLUMNS}
+DATASET_DTYPES.update({c: np.float64 for c in FLOAT64_COLUMNS})
+
+
+def cache_dir_for(csv_path, cache_root=None):
+    root = cache_root or os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR)
+    return os.path.join(root, os.path.splitext(os.path.basename(csv_path))[0])
+
+
+def source_signature(csv_path):
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _manifest_matches(manifest, signature):
+    return manifest is not None and manifest.get("format") == CACHE_FORMAT and manifest.get("source") == signature
+
+
+def cache_is_fresh(csv_path, cache_root=None):
+    return _manifest_matches(_read_manifest(cache_dir_for(csv_path, cache_root)), source_signature(csv_path))
+
+
+# -------------------------
+# Cache build: one .npy per column + a JSON manifest
+# -------------------------
+def build_cache(csv_path, cache_root=None, dtypes=None):
+    """
+    Parse the CSV once with explicit dtypes and write every column as its own .npy file.
+    String columns become categoricals (int codes on disk, categories in the manifest);
+    float columns not listed as float64 are narrowed to float32.
+    """
+    cache_dir = cache_dir_for(csv_path, cache_root)
+    signature = source_signature(csv_path)
+    previous = _read_manifest(cache_dir)
+    dtypes = DATASET_DTYPES if dtypes is None else dtypes
+    header = pd.read_csv(csv_path, nrows=0).columns
+    df = pd.read_csv(csv_path, dtype={c: t for c, t in dtypes.items() if c in header})
+
+    # a private temp dir per builder: the app, CLIs and scenario runs may build the same cache at once
+    parent = os.path.dirname(cache_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=os.path.basename(cache_dir) + ".tmp-", dir=parent)
+    try:
+        columns = {}
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            if series.dtype == object:
+                series = series.astype("category")
+            entry = {"file": f"{i:03d}.npy"}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.cat.codes.to_numpy()
+                entry["categories"] = series.cat.categories.tolist()
+            elif series.dtype == np.float64 and dtypes.get(name) is not np.float64:
+                values = series.to_numpy(dtype=np.float32)
+            else:
+                values = series.to_numpy()
+            entry["dtype"] = values.dtype.str
+            np.save(os.path.join(tmp_dir, entry["file"]), values)
+            columns[name] = entry
+
+        manifest = {"format": CACHE_FORMAT, "source": signature, "rows": len(df), "columns": columns}
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+        return _install_cache(tmp_dir, cache_dir, manifest, previous)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _install_cache(tmp_dir, cache_dir, manifest, previous):
+    """
+    Rename a finished build into place. If another builder installed a cache for the same source
+    while this one ran (anything but `previous`, the manifest seen before building), keep theirs;
+    otherwise the old cache is moved aside first (renames are atomic, rmtree is not).
+    """
+    for attempt in range(2):
+        try:
+            os.replace(tmp_dir, cache_dir)
+            return manifest
+        except OSError:
+            current = _read_manifest(cache_dir)
+            if _manifest_matches(current, manifest["source"]) and (attempt or current != previous):
+                return current
+            if attempt:
+                raise
+        stale = tempfile.mkdtemp(prefix=os.path.basename(cache_dir) + ".stale-", dir=os.path.dirname(cache_dir))
+        try:
+            os.replace(cache_dir, stale)
+        except FileNotFoundError:
+            pass  # another builder moved it already
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+# -------------------------
+# Loading
+# -------------------------
+def load_dataset(csv_path, columns=None, cache_root=None, mmap=True):
+    """
+    Input: path to the source CSV, optional list of columns to project
+    Returns: DataFrame read from the columnar cache, rebuilding it first if the CSV changed.
+    Only the requested columns' files are opened; with mmap=True they are memory-mapped
+    read-only, so writing into a numeric column (df.loc[...] = ...) raises ValueError.
+    Pass mmap=False, or .copy() the frame, to modify the data.
+    """
+    cache_dir = cache_dir_for(csv_path, cache_root)
+    manifest = _read_manifest(cache_dir)
+    if not _manifest_matches(manifest, source_signature(csv_path)):
+        manifest = build_cache(csv_path, cache_root)
+
+    names = list(manifest["columns"]) if columns is None else list(columns)
+    missing = [c for c in names if c not in manifest["columns"]]
+    if missing:
+        raise KeyError(f"Columns not in {os.path.basename(csv_path)}: {', '.join(missing)}")
+
+    data = {}
+    for name in names:
+        entry = manifest["columns"][name]
+        values = np.load(os.path.join(cache_dir, entry["file"]), mmap_mode="r" if mmap else None)
+        if "categories" in entry:
+            data[name] = pd.Categorical.from_codes(values, categories=entry["categories"])
+        else:
+            data[name] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the columnar cache for dataset CSVs.")
+    parser.add_argument("csv", nargs="+", help="source CSV files")
+    parser.add_argument("--cache-root", default=None, help=f"cache directory (default: <csv dir>/{CACHE_DIR})")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the cache is fresh")
+    args = parser.parse_args(argv)
+
+    for path in args.csv:
+        if not args.force and cache_is_fresh(path, args.cache_root):
+            print(f"{path}: cache is fresh ({cache_dir_for(path, args.cache_root)})")
+            continue
+        start = time.perf_counter()
+        manifest = build_cache(path, args.cache_root)
+        print(f"{path}: cached {manifest['rows']} rows x {len(manifest['columns'])} columns "
+              f"in {time.perf_counter() - start:.2f}s -> {cache_dir_for(path, args.cache_root)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_store import CATEGORICAL_COLUMNS
+from risk_model import FEATURES, MODEL_PATH, alert_levels, file_sha256, load_fast_model, predict_scores
+
+MANIFEST = "_manifest.json"
+MANIFEST_FORMAT = 2
+DEFAULT_CHUNK_ROWS = 250_000
+GAMMA_WATER_KN_M3 = 9.81
+
+
+# -------------------------
+# Declared transforms
+# -------------------------
+class Transform:
+    """
+    A derived-column step: `fn(frame of inputs) -> {output column: array}`.
+    A chunk's outputs are recomputed only when the fingerprint of (name, version, token,
+    input column contents) differs from the one stored for that chunk.
+    token: optional callable for state outside the data (e.g. the model file), evaluated once per run
+    """
+
+    def __init__(self, name, inputs, outputs, fn, version=1, token=None):
+        self.name = name
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.fn = fn
+        self.version = version
+        self.token = token
+
+    def fingerprint(self, column_hashes, token_value=None):
+        h = hashlib.sha256(f"{self.name}:{self.version}:{token_value}".encode())
+        for column in self.inputs:
+            h.update(column_hashes[column].encode())
+        return h.hexdigest()
+
+
+TRANSFORMS = []
+
+
+def transform(inputs, outputs, version=1, token=None):
+    def register(fn):
+        TRANSFORMS.append(Transform(fn.__name__, inputs, outputs, fn, version, token))
+        return fn
+    return register
+
+
+def _ratio(a, b):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(b != 0, a / b, np.nan)
+
+
+@transform(inputs=["pore_pressure_kpa"], outputs=["pore_pressure_head_m"])
+def pore_pressure_head(df):
+    return {"pore_pressure_head_m": df["pore_pressure_kpa"].to_numpy(dtype=np.float64) / GAMMA_WATER_KN_M3}
+
+
+@transform(inputs=["pore_pressure_kpa", "unit_weight_kn_m3", "slope_height_km"], outputs=["pore_pressure_ratio_calc"])
+def pore_pressure_ratio(df):
+    # r_u = u / (gamma * h), with the slope height as the overburden depth
+    overburden = df["unit_weight_kn_m3"].to_numpy(dtype=np.float64) * df["slope_height_km"].to_numpy(dtype=np.float64) * 1000
+    return {"pore_pressure_ratio_calc": _ratio(df["pore_pressure_kpa"], overburden)}
+
+
+@transform(inputs=["rainfall_mm_day", "cumulative_rainfall_mm"],
+           outputs=["antecedent_rainfall_mm", "rainfall_window_days"])
+def rainfall_windows(df):
+    daily = df["rainfall_mm_day"].to_numpy(dtype=np.float64)
+    cumulative = df["cumulative_rainfall_mm"].to_numpy(dtype=np.float64)
+    return {
+        "antecedent_rainfall_mm": cumulative - daily,
+        # days of today's intensity that add up to the cumulative total
+        "rainfall_window_days": _ratio(cumulative, daily),
+    }
+
+
+@transform(inputs=["crack_length_km", "crack_width_km"], outputs=["crack_aspect_ratio"])
+def crack_aspect(df):
+    return {"crack_aspect_ratio": _ratio(df["crack_length_km"], df["crack_width_km"])}
+
+
+@transform(inputs=["displacement_mm", "displacement_rate_mm_day"], outputs=["displacement_days"])
+def displacement_duration(df):
+    return {"displacement_days": _ratio(df["displacement_mm"], df["displacement_rate_mm_day"])}
+
+
+_MODEL = None
+_MODEL_PATH = MODEL_PATH
+
+
+def _set_model_path(path):
+    global _MODEL, _MODEL_PATH
+    _MODEL, _MODEL_PATH = None, path
+
+
+def _model():
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = load_fast_model(_MODEL_PATH)
+    return _MODEL
+
+
+@transform(inputs=FEATURES, outputs=["risk_score_pred", "alert_level_pred"],
+           token=lambda: file_sha256(_MODEL_PATH))
+def risk_prediction(df):
+    X = df[FEATURES].to_numpy(dtype=np.float64)
+    scores = predict_scores(_model(), X)
+    levels = alert_levels(scores)
+    incomplete = np.isnan(X).any(axis=1)
+    scores[incomplete] = np.nan
+    levels[incomplete] = None
+    return {"risk_score_pred": scores, "alert_level_pred": levels}
+
+
+# -------------------------
+# Chunk worker
+# -------------------------
+def column_hash(series):
+    return hashlib.sha256(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes()).hexdigest()[:16]
+
+
+def _enrich_chunk(index, csv_path, byte_range, columns, out_dir, previous, tokens):
+    """
+    Parse one byte range of the CSV, enrich it and write it as a Parquet part
+    (source columns + derived columns).
+    previous: manifest entry for this chunk from the last run, or None.
+    Returns: (manifest entry, names of the transforms that were recomputed)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with open(csv_path, "rb") as f:
+        f.seek(byte_range[0])
+        raw = f.read(byte_range[1] - byte_range[0])
+    path = os.path.join(out_dir, f"part-{index:05d}.parquet")
+    raw_hash = hashlib.sha256(raw).hexdigest()
+    versions = {t.name: t.version for t in TRANSFORMS}
+    if (previous is not None and previous.get("raw") == raw_hash and previous.get("tokens") == tokens
+            and previous.get("versions") == versions and os.path.exists(path)):
+        return previous, []  # same bytes, same transforms and versions: nothing to parse
+
+    # fixed string dtypes keep every part's schema the same even if a chunk has an all-empty column
+    chunk = pd.read_csv(io.BytesIO(raw), header=None, names=columns, low_memory=False, float_precision="round_trip",
+                        dtype={c: str for c in CATEGORICAL_COLUMNS if c in columns})
+    hashes = {c: column_hash(chunk[c]) for c in chunk.columns}
+    fingerprints = {t.name: t.fingerprint(hashes, tokens.get(t.name)) for t in TRANSFORMS}
+    entry = {"file": os.path.basename(path), "rows": len(chunk), "raw": raw_hash, "tokens": tokens,
+             "versions": versions, "transforms": fingerprints}
+    reusable = previous is not None and previous["rows"] == len(chunk) and os.path.exists(path)
+    kept = [t for t in TRANSFORMS if reusable and previous["transforms"].get(t.name) == fingerprints[t.name]]
+    if reusable and len(kept) == len(TRANSFORMS) and previous.get("columns_hash") == _columns_hash(hashes):
+        entry["columns_hash"] = previous["columns_hash"]
+        return entry, []  # bytes moved around but every value is the same
+    entry["columns_hash"] = _columns_hash(hashes)
+
+    old = pq.read_table(path, columns=[c for t in kept for c in t.outputs]).to_pandas() if kept else None
+    out = chunk
+    recomputed = []
+    for t in TRANSFORMS:
+        if t in kept:
+            values = {c: old[c].to_numpy() for c in t.outputs}
+        else:
+            values = t.fn(out[t.inputs])
+            recomputed.append(t.name)
+        for column in t.outputs:
+            out[column] = values[column]
+
+    tmp = path + ".tmp"
+    pq.write_table(pa.Table.from_pandas(out, preserve_index=False), tmp)
+    os.replace(tmp, path)
+    return entry, recomputed
+
+
+def _columns_hash(hashes):
+    return hashlib.sha256("".join(c + h for c, h in hashes.items()).encode()).hexdigest()
+
+
+def chunk_ranges(csv_path, chunk_rows, block_bytes=1 << 24):
+    """
+    Header columns and the byte range of every chunk_rows-line chunk after the header,
+    found by scanning for newlines block by block (assumes no newlines inside quoted fields).
+    """
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        columns = next(csv.reader([header.decode("utf-8-sig")]))
+        start = pos = f.tell()
+        ranges = []
+        lines = 0
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                break
+            ends = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10) + pos + 1
+            # newlines that complete a chunk
+            for end in ends[(lines + np.arange(1, len(ends) + 1)) % chunk_rows == 0].tolist():
+                ranges.append((start, end))
+                start = end
+            lines += len(ends)
+            pos += len(block)
+        if pos > start:
+            ranges.append((start, pos))
+    return columns, ranges
+
+
+# -------------------------
+# Pipeline
+# -------------------------
+def _read_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == MANIFEST_FORMAT else None
+
+
+def enrich(csv_path, out_dir, chunk_rows=DEFAULT_CHUNK_ROWS, workers=None, force=False, model_path=MODEL_PATH):
+    """
+    Split csv_path into chunk_rows-line byte ranges; worker processes parse, enrich and write one
+    Parquet part per range. Only about 2 x workers chunks are in memory at once, so the source
+    can be larger than RAM, and a chunk whose bytes are unchanged is not even parsed.
+    Returns: dict of run statistics
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = None if force else _read_manifest(out_dir)
+    if manifest is not None and manifest.get("chunk_rows") != chunk_rows:
+        manifest = None  # chunk boundaries moved, nothing lines up
+    previous = manifest["chunks"] if manifest else []
+    _set_model_path(model_path)
+    tokens = {t.name: t.token() for t in TRANSFORMS if t.token is not None}
+
+    workers = workers or os.cpu_count() or 1
+    entries = []
+    recomputed = {t.name: 0 for t in TRANSFORMS}
+    rows = 0
+    written = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_set_model_path, initargs=(model_path,)) as pool:
+        pending = []
+
+        def collect(future):
+            nonlocal rows, written
+            entry, names = future.result()
+            entries.append(entry)
+            rows += entry["rows"]
+            for name in names:
+                recomputed[name] += 1
+            written += bool(names)
+
+        columns, ranges = chunk_ranges(csv_path, chunk_rows)
+        for index, byte_range in enumerate(ranges):
+            old = previous[index] if index < len(previous) else None
+            pending.append(pool.submit(_enrich_chunk, index, csv_path, byte_range, columns, out_dir, old, tokens))
+            if len(pending) >= 2 * workers:
+                collect(pending.pop(0))
+        for future in pending:
+            collect(future)
+
+    for stale in previous[len(entries):]:
+        try:
+            os.remove(os.path.join(out_dir, stale["file"]))
+        except OSError:
+            pass
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "source": os.path.abspath(csv_path),
+        "chunk_rows": chunk_rows,
+        "rows": rows,
+        "transforms": {t.name: {"inputs": t.inputs, "outputs": t.outputs, "version": t.version} for t in TRANSFORMS},
+        "chunks": entries,
+    }
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return {"rows": rows, "chunks": len(entries), "chunks_written": written, "recomputed": recomputed,
+            "elapsed_s": time.perf_counter() - start}
+
+
+def load_enriched(out_dir, columns=None):
+    """Read the enriched parts back as one DataFrame (optionally only some columns)."""
+    import pyarrow.parquet as pq
+
+    manifest = _read_manifest(out_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No enrichment manifest in {out_dir}")
+    files = [os.path.join(out_dir, c["file"]) for c in manifest["chunks"]]
+    return pq.ParquetDataset(files).read(columns=columns).to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Derive feature columns from a dataset CSV into Parquet parts.")
+    parser.add_argument("csv", nargs="?", default="merged_dataset.csv")
+    parser.add_argument("-o", "--output", default=None, help="output directory (default: <csv stem>_enriched/)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="processes (default: all CPUs)")
+    parser.add_argument("--model", default=MODEL_PATH, help="model used for the risk_prediction transform")
+    parser.add_argument("--force", action="store_true", help="recompute everything")
+    args = parser.parse_args(argv)
+
+    out_dir = args.output or f"{os.path.splitext(args.csv)[0]}_enriched"
+    stats = enrich(args.csv, out_dir, args.chunk_rows, args.workers, args.force, args.model)
+    rate = stats["rows"] / stats["elapsed_s"] if stats["elapsed_s"] > 0 else float("inf")
+    print(f"{stats['rows']:,} rows in {stats['chunks']} chunks, {stats['chunks_written']} rewritten, "
+          f"{stats['elapsed_s']:.2f}s ({rate:,.0f} rows/s) -> {out_dir}")
+    for name, count in stats["recomputed"].items():
+        print(f"  {name:<24} recomputed in {count}/{stats['chunks']} chunks")
+
+
+if __name__ == "__main__":
+    main()
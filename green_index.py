@@ -0,0 +1,260 @@
+import io
+import threading
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Largest image accepted from any source (uploads, bulk folders, the service, the CLI):
+# 40000 x 40000 px, well above the drone/satellite orthomosaics full-resolution mode is for.
+# Pillow's own default (~89 MP) rejects those; this still refuses decompression bombs.
+MAX_IMAGE_PIXELS = 40_000 * 40_000
+_open_lock = threading.Lock()
+
+
+def open_image(source, max_pixels=MAX_IMAGE_PIXELS):
+    """
+    Open a path, file object or encoded bytes lazily with an explicit pixel limit.
+    Pillow only has a process-wide limit, so it is lifted just for this open (under a lock)
+    and max_pixels is enforced here instead. Raises Image.DecompressionBombError above it.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    with _open_lock:
+        saved = Image.MAX_IMAGE_PIXELS
+        Image.MAX_IMAGE_PIXELS = None
+        try:
+            img = Image.open(source)
+        finally:
+            Image.MAX_IMAGE_PIXELS = saved
+    w, h = img.size
+    if max_pixels is not None and w * h > max_pixels:
+        img.close()
+        raise Image.DecompressionBombError(f"image of {w}x{h} = {w * h} pixels exceeds the limit of "
+                                           f"{max_pixels} pixels")
+    return img
+
+
+# -------------------------
+# Image processing helper
+# -------------------------
+def _resize_to_width(img, max_width=800):
+    h, w = img.shape[:2]
+    if w > max_width:
+        ratio = max_width / w
+        img = cv2.resize(img, (int(w * ratio), int(h * ratio)), interpolation=cv2.INTER_AREA)
+    return img
+
+
+def calculate_green_percentage(pil_img, lower_h=35, upper_h=85, lower_s=40, lower_v=40):
+    """
+    Input: PIL Image (RGB)
+    Returns: green_percent (0-100 float), mask_rgb (H,W,3), img_rgb (H,W,3)
+    """
+    img = _resize_to_width(np.array(pil_img))  # RGB
+
+    # convert to HSV and compute mask
+    bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    lower = np.array([lower_h, lower_s, lower_v])
+    upper = np.array([upper_h, 255, 255])
+    mask = cv2.inRange(hsv, lower, upper)
+
+    green_pixels = int(np.count_nonzero(mask))
+    total_pixels = mask.size if mask.size > 0 else 1
+    green_percent = (green_pixels / total_pixels) * 100.0
+
+    mask_rgb = cv2.cvtColor(mask, cv2.COLOR_GRAY2RGB)
+    img_rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+    return green_percent, mask_rgb, img_rgb
+
+
+def green_percentage_from_bytes(image_bytes, lower_h=35, upper_h=85, lower_s=40, lower_v=40, tiled=False):
+    """
+    Input: encoded image bytes (jpg/png)
+    Returns: same tuple as calculate_green_percentage
+    With tiled=True the percentage is computed at full resolution by green_percentage_tiled.
+    """
+    if tiled:
+        return green_percentage_tiled(
+            open_image(image_bytes), lower_h=lower_h, upper_h=upper_h, lower_s=lower_s, lower_v=lower_v
+        )
+    pil_img = open_image(image_bytes).convert("RGB")
+    return calculate_green_percentage(
+        pil_img, lower_h=lower_h, upper_h=upper_h, lower_s=lower_s, lower_v=lower_v
+    )
+
+
+# -------------------------
+# Tiled (memory-bounded) green index for very large images
+# -------------------------
+DEFAULT_TILE_SIZE = 1024
+PREVIEW_WIDTH = 800
+
+
+def open_tiled_source(path):
+    """
+    Open a large image without building a full-size array up front.
+    .npy files (H,W,3 uint8 RGB) are memory-mapped; anything else is opened lazily with PIL.
+    """
+    if str(path).lower().endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    return open_image(path)
+
+
+def _source_size(source):
+    if isinstance(source, np.ndarray):
+        return source.shape[1], source.shape[0]
+    return source.size
+
+
+def _read_tile(source, x0, y0, x1, y1):
+    if isinstance(source, np.ndarray):
+        return np.ascontiguousarray(source[y0:y1, x0:x1, :3])
+    return np.asarray(source.crop((x0, y0, x1, y1)).convert("RGB"))
+
+
+def _tiles_with_mosaic(source, tile_size=DEFAULT_TILE_SIZE, preview_width=PREVIEW_WIDTH):
+    """
+    Returns: (mosaic, tiles) where iterating tiles yields each RGB tile in turn and pastes its
+    downsampled copy into mosaic, so the preview never needs a full-resolution array.
+    """
+    w, h = _source_size(source)
+    scale = max(1, -(-w // preview_width))  # ceil(w / preview_width)
+    tile_size = max(scale, tile_size - tile_size % scale)  # keep tiles aligned to the preview grid
+    mosaic = np.zeros((-(-h // scale), -(-w // scale), 3), dtype=np.uint8)
+
+    def tiles():
+        for y0 in range(0, h, tile_size):
+            y1 = min(y0 + tile_size, h)
+            for x0 in range(0, w, tile_size):
+                x1 = min(x0 + tile_size, w)
+                tile = _read_tile(source, x0, y0, x1, y1)
+                yield tile
+                ph, pw = -(-(y1 - y0) // scale), -(-(x1 - x0) // scale)
+                small = tile if scale == 1 else cv2.resize(tile, (pw, ph), interpolation=cv2.INTER_AREA)
+                mosaic[y0 // scale:y0 // scale + ph, x0 // scale:x0 // scale + pw] = small
+
+    return mosaic, tiles()
+
+
+def green_percentage_tiled(source, lower_h=35, upper_h=85, lower_s=40, lower_v=40,
+                           tile_size=DEFAULT_TILE_SIZE, preview_width=PREVIEW_WIDTH):
+    """
+    Input: (H,W,3) RGB array / np.memmap, or a PIL Image
+    Returns: green_percent (0-100 float, full resolution), mask_rgb and img_rgb previews
+    Only one tile is converted to HSV at a time, so peak memory is bounded by tile_size.
+    """
+    w, h = _source_size(source)
+    lower = np.array([lower_h, lower_s, lower_v])
+    upper = np.array([upper_h, 255, 255])
+
+    green_pixels = 0
+    hsv = mask = None
+    mosaic, tiles = _tiles_with_mosaic(source, tile_size, preview_width)
+    for tile in tiles:
+        if hsv is None or hsv.shape[:2] != tile.shape[:2]:
+            hsv = np.empty_like(tile)
+            mask = np.empty(tile.shape[:2], dtype=np.uint8)
+        cv2.cvtColor(tile, cv2.COLOR_RGB2HSV, dst=hsv)
+        cv2.inRange(hsv, lower, upper, dst=mask)
+        green_pixels += cv2.countNonZero(mask)
+
+    total_pixels = w * h if w * h > 0 else 1
+    green_percent = (green_pixels / total_pixels) * 100.0
+
+    preview_mask = cv2.inRange(cv2.cvtColor(mosaic, cv2.COLOR_RGB2HSV), lower, upper)
+    return green_percent, cv2.cvtColor(preview_mask, cv2.COLOR_GRAY2RGB), mosaic
+
+
+# -------------------------
+# Precomputed HSV cube: exact green percentage for any threshold in O(1)
+# -------------------------
+class HSVCube:
+    """
+    Cumulative pixel counts of one image: counts[h, s, v] = number of pixels with
+    hue < h, saturation >= s and value >= v (OpenCV 8-bit HSV, hue 0-179).
+    calculate_green_percentage's inRange test (upper S/V fixed at 255) is then two lookups.
+    Also keeps the preview image and its HSV so masks can be redrawn without re-decoding.
+    """
+
+    def __init__(self, counts, total_pixels, preview_rgb, preview_hsv):
+        self.counts = counts
+        self.total_pixels = total_pixels
+        self.preview_rgb = preview_rgb
+        self.preview_hsv = preview_hsv
+
+    @classmethod
+    def from_histogram(cls, hist, total_pixels, preview_rgb, preview_hsv=None):
+        """hist: flat (180*256*256,) pixel counts indexed by h<<16 | s<<8 | v."""
+        counts = np.zeros((181, 257, 257), dtype=np.uint32)  # zero padding at h=0, s=256, v=256
+        counts[1:, :256, :256] = hist.reshape(180, 256, 256)
+        np.cumsum(counts[:, :, ::-1], axis=2, out=counts[:, :, ::-1])  # suffix sums over V
+        np.cumsum(counts[:, ::-1, :], axis=1, out=counts[:, ::-1, :])  # suffix sums over S
+        np.cumsum(counts, axis=0, out=counts)  # prefix sums over H
+        if preview_hsv is None:
+            preview_hsv = cv2.cvtColor(preview_rgb, cv2.COLOR_RGB2HSV)
+        return cls(counts, total_pixels, preview_rgb, preview_hsv)
+
+    def green_pixels(self, lower_h=35, upper_h=85, lower_s=40, lower_v=40):
+        """Scalars or broadcastable arrays of thresholds (vectorized sweeps)."""
+        lh = np.clip(lower_h, 0, 180)
+        uh = np.maximum(np.clip(np.asarray(upper_h) + 1, 0, 180), lh)
+        s = np.clip(lower_s, 0, 256)
+        v = np.clip(lower_v, 0, 256)
+        return self.counts[uh, s, v].astype(np.int64) - self.counts[lh, s, v]
+
+    def green_percentage(self, lower_h=35, upper_h=85, lower_s=40, lower_v=40):
+        pct = self.green_pixels(lower_h, upper_h, lower_s, lower_v) * (100.0 / max(self.total_pixels, 1))
+        return float(pct) if np.ndim(pct) == 0 else pct
+
+    def mask_preview(self, lower_h=35, upper_h=85, lower_s=40, lower_v=40):
+        mask = cv2.inRange(self.preview_hsv, np.array([lower_h, lower_s, lower_v]), np.array([upper_h, 255, 255]))
+        return cv2.cvtColor(mask, cv2.COLOR_GRAY2RGB)
+
+
+def _hsv_histogram(hsv):
+    idx = (hsv[..., 0].astype(np.int32) << 16) | (hsv[..., 1].astype(np.int32) << 8) | hsv[..., 2]
+    return np.bincount(idx.ravel(), minlength=180 * 256 * 256)
+
+
+def build_hsv_cube(pil_img, full_resolution=False, tile_size=DEFAULT_TILE_SIZE):
+    """
+    Input: PIL Image
+    Returns: HSVCube over the same pixels calculate_green_percentage uses (resized to
+    800 px wide), or over every pixel tile by tile with full_resolution=True.
+    """
+    if full_resolution:
+        w, h = _source_size(pil_img)
+        hist = np.zeros(180 * 256 * 256, dtype=np.int64)
+        mosaic, tiles = _tiles_with_mosaic(pil_img, tile_size)
+        for tile in tiles:
+            hist += _hsv_histogram(cv2.cvtColor(tile, cv2.COLOR_RGB2HSV))
+        return HSVCube.from_histogram(hist, w * h, mosaic)
+
+    img = _resize_to_width(np.array(pil_img.convert("RGB")))
+    hsv = cv2.cvtColor(img, cv2.COLOR_RGB2HSV)
+    return HSVCube.from_histogram(_hsv_histogram(hsv), hsv.shape[0] * hsv.shape[1], img, hsv)
+
+
+def build_hsv_cube_from_bytes(image_bytes, full_resolution=False):
+    return build_hsv_cube(open_image(image_bytes), full_resolution=full_resolution)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Full-resolution tiled green index for large images.")
+    parser.add_argument("images", nargs="+", help="image files or .npy RGB arrays")
+    parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE)
+    args = parser.parse_args(argv)
+
+    for path in args.images:
+        start = time.perf_counter()
+        green_percent, _, _ = green_percentage_tiled(open_tiled_source(path), tile_size=args.tile_size)
+        print(f"{path}: {green_percent:.4f}% green ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+In-process latency histograms and counters with Prometheus text exposition.
+
+app.py times each stage with `STAGES.time("predict")` etc. The numbers can be scraped from
+http://127.0.0.1:$GEOROOTS_METRICS_PORT/metrics and/or written to $GEOROOTS_METRICS_FILE
+(node_exporter textfile collector format) after every script run. Everything lives in this
+module, so it is shared by all sessions of one Streamlit process.
+"""
+import atexit
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# seconds; spans a cached lookup (~10 us) up to a slow full-resolution image (~10 s)
+DEFAULT_BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0)
+METRICS_PORT_ENV = "GEOROOTS_METRICS_PORT"
+METRICS_FILE_ENV = "GEOROOTS_METRICS_FILE"
+
+
+def _format_value(value):
+    return repr(float(value)) if value not in (float("inf"), float("-inf")) else ("+Inf" if value > 0 else "-Inf")
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in pairs) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram; observe() is a bisect and three additions under a lock."""
+
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for label_values, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, label_values, ('le', _format_value(bound)))}"
+                             f" {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, label_values, ('le', '+Inf'))} {values[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, label_values)} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, label_values)} {values[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values) or ({(): 0} if not self.label_names else {})
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, label_names, buckets)
+
+    def counter(self, name, help_text, label_names=()):
+        return self._get(Counter, name, help_text, label_names)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self.metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.expose()) + "\n"
+
+    def write_textfile(self, path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+
+
+# -------------------------
+# Local /metrics endpoint (one per process)
+# -------------------------
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve(port, registry=REGISTRY, host="127.0.0.1"):
+    """Start a background HTTP server answering GET /metrics; later calls are no-ops."""
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, int(port)), Handler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
+
+
+# -------------------------
+# Single-run profiling
+# -------------------------
+class RunProfiler:
+    """
+    cProfile capture of one script run; writes a .prof file and returns the top functions.
+    As a context manager it is finished however the block exits. A Streamlit script cannot be
+    wrapped in one block, so a run that raised (rerun, st.stop, Ctrl-C) leaves its profiler
+    `active`: finish_abandoned() closes it, at the start of the next run and at exit.
+    """
+
+    active = None
+
+    def __init__(self, out_dir="profiles"):
+        import cProfile
+
+        RunProfiler.finish_abandoned()
+        self.out_dir = out_dir
+        self.result = None
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        RunProfiler.active = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.finish()
+        return False
+
+    @classmethod
+    def finish_abandoned(cls):
+        """Finish (disable and dump) a profile whose run ended without calling finish()."""
+        if cls.active is not None:
+            return cls.active.finish()
+        return None
+
+    def finish(self, limit=25):
+        import io
+        import pstats
+
+        if self.result is not None:
+            return self.result
+        try:
+            self.profile.disable()
+        finally:
+            if RunProfiler.active is self:
+                RunProfiler.active = None
+            os.makedirs(self.out_dir, exist_ok=True)
+            path = os.path.join(self.out_dir, time.strftime("run-%Y%m%d-%H%M%S.prof"))
+            self.profile.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        self.result = path, out.getvalue()
+        return self.result
+
+
+atexit.register(RunProfiler.finish_abandoned)
@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from prediction_service import DEFAULT_HOST, DEFAULT_PORT
+from risk_model import FEATURES
+
+
+def random_slope(rng):
+    return {
+        "slope_angle_deg": rng.uniform(0, 90),
+        "factor_of_safety": rng.uniform(0.3, 3.0),
+        "green_index": rng.uniform(0, 1),
+        "rainfall_mm_day": rng.uniform(0, 200),
+        "pore_pressure_kpa": rng.uniform(0, 100),
+    }
+
+
+async def post_json(reader, writer, host, path, obj):
+    body = json.dumps(obj).encode("utf-8")
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.strip().lower() == "content-length":
+            length = int(value.strip())
+    payload = await reader.readexactly(length)
+    if b" 200 " not in status_line:
+        raise RuntimeError(f"{status_line.decode().strip()}: {payload.decode()}")
+    return json.loads(payload)
+
+
+async def client(host, port, path, n_requests, batch_rows, seed, latencies):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n_requests):
+            if batch_rows:
+                obj = {"rows": [random_slope(rng) for _ in range(batch_rows)]}
+            else:
+                obj = random_slope(rng)
+            start = time.perf_counter()
+            await post_json(reader, writer, host, path, obj)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run(host, port, concurrency, requests_per_client, batch_rows):
+    path = "/predict_batch" if batch_rows else "/predict"
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, path, requests_per_client, batch_rows, seed, latencies)
+        for seed in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.array(latencies) * 1000.0
+    rows = len(latencies) * (batch_rows or 1)
+    print(f"{path}: {len(latencies)} requests, {concurrency} concurrent clients, {len(FEATURES)} features/row")
+    print(f"  p50 latency : {np.percentile(lat_ms, 50):.2f} ms")
+    print(f"  p99 latency : {np.percentile(lat_ms, 99):.2f} ms")
+    print(f"  throughput  : {len(latencies) / elapsed:,.0f} req/s ({rows / elapsed:,.0f} rows/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test a running prediction_service.py instance.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-c", "--concurrency", type=int, default=64, help="concurrent connections")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="requests per connection")
+    parser.add_argument("--batch-rows", type=int, default=0,
+                        help="rows per /predict_batch request (0 = single-row /predict)")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.host, args.port, args.concurrency, args.requests, args.batch_rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from risk_model import FEATURES, MODEL_PATH, load_artifact
+
+TARGET = "risk_score"
+DEFAULT_ALPHA = 0.33  # alpha of the shipped ridge_reg.pkl
+
+
+def stats_path_for(model_path):
+    return os.path.splitext(model_path)[0] + ".stats.npz"
+
+
+def _batch_stats(X, y):
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    return {
+        "n": float(len(y)),
+        "sum_x": X.sum(axis=0),
+        "sum_y": float(y.sum()),
+        "sum_yy": float(y @ y),
+        "xtx": X.T @ X,
+        "xty": X.T @ y,
+    }
+
+
+# -------------------------
+# Sufficient statistics for ridge regression
+# -------------------------
+class RidgeStats:
+    """
+    Running XᵀX, Xᵀy, yᵀy, column sums and row count over all folded-in batches.
+    Folding in a batch is O(batch); solving is a 5x5 linear system, independent of history size.
+    Per-batch statistics are kept so any batch can be rolled back exactly.
+    """
+
+    def __init__(self, n_features=len(FEATURES), alpha=DEFAULT_ALPHA):
+        self.alpha = alpha
+        self.n = 0.0
+        self.sum_x = np.zeros(n_features)
+        self.sum_y = 0.0
+        self.sum_yy = 0.0
+        self.xtx = np.zeros((n_features, n_features))
+        self.xty = np.zeros(n_features)
+        self.batches = []  # list of (batch_id, stats dict), oldest first
+
+    def update(self, X, y, batch_id=None):
+        stats = _batch_stats(X, y)
+        if batch_id is None:
+            batch_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+        if any(b == batch_id for b, _ in self.batches):
+            raise ValueError(f"batch {batch_id!r} already folded in")
+        self._apply(stats, 1.0)
+        self.batches.append((batch_id, stats))
+        return batch_id
+
+    def rollback(self, batch_id=None):
+        """Remove a batch (the most recent one by default). Returns the removed batch id."""
+        if not self.batches:
+            raise ValueError("no batches to roll back")
+        ids = [b for b, _ in self.batches]
+        if batch_id is not None and batch_id not in ids:
+            raise ValueError(f"unknown batch {batch_id!r}; known batches: {', '.join(map(repr, ids))}")
+        idx = len(ids) - 1 if batch_id is None else ids.index(batch_id)
+        removed_id, stats = self.batches.pop(idx)
+        self._apply(stats, -1.0)
+        return removed_id
+
+    def _apply(self, stats, sign):
+        self.n += sign * stats["n"]
+        self.sum_x += sign * stats["sum_x"]
+        self.sum_y += sign * stats["sum_y"]
+        self.sum_yy += sign * stats["sum_yy"]
+        self.xtx += sign * stats["xtx"]
+        self.xty += sign * stats["xty"]
+
+    def solve(self, alpha=None):
+        """
+        Same solution as sklearn Ridge(fit_intercept=True): ridge on centred data, then
+        intercept = mean(y) - mean(x) · coef.
+        Returns: (coef, intercept)
+        """
+        if self.n <= 0:
+            raise ValueError("no observations folded in")
+        alpha = self.alpha if alpha is None else alpha
+        mean_x = self.sum_x / self.n
+        mean_y = self.sum_y / self.n
+        xtx_c = self.xtx - self.n * np.outer(mean_x, mean_x)
+        xty_c = self.xty - self.n * mean_x * mean_y
+        coef = np.linalg.solve(xtx_c + alpha * np.eye(len(mean_x)), xty_c)
+        return coef, float(mean_y - mean_x @ coef)
+
+    def to_model(self, alpha=None):
+        """A fitted sklearn Ridge carrying the solved coefficients."""
+        from sklearn.linear_model import Ridge
+
+        alpha = self.alpha if alpha is None else alpha
+        coef, intercept = self.solve(alpha)
+        model = Ridge(alpha=alpha)
+        model.coef_ = coef
+        model.intercept_ = intercept
+        model.n_features_in_ = len(coef)
+        model.feature_names_in_ = np.array(FEATURES, dtype=object)
+        return model
+
+    # -------------------------
+    # Persistence (a single .npz next to the model)
+    # -------------------------
+    def save(self, path):
+        ids = [b for b, _ in self.batches]
+        stacked = {
+            f"batch_{key}": np.array([s[key] for _, s in self.batches])
+            for key in ("n", "sum_x", "sum_y", "sum_yy", "xtx", "xty")
+        }
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, alpha=self.alpha, n=self.n, sum_x=self.sum_x, sum_y=self.sum_y, sum_yy=self.sum_yy,
+                 xtx=self.xtx, xty=self.xty, batch_ids=np.array(ids, dtype=str), **stacked)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        stats = cls(n_features=len(data["sum_x"]), alpha=float(data["alpha"]))
+        stats.n = float(data["n"])
+        stats.sum_x = data["sum_x"].copy()
+        stats.sum_y = float(data["sum_y"])
+        # files written before yᵀy was tracked cannot give residual variance
+        stats.sum_yy = float(data["sum_yy"]) if "sum_yy" in data else float("nan")
+        stats.xtx = data["xtx"].copy()
+        stats.xty = data["xty"].copy()
+        for i, batch_id in enumerate(data["batch_ids"]):
+            stats.batches.append((str(batch_id), {
+                "n": float(data["batch_n"][i]),
+                "sum_x": data["batch_sum_x"][i],
+                "sum_y": float(data["batch_sum_y"][i]),
+                "sum_yy": float(data["batch_sum_yy"][i]) if "batch_sum_yy" in data else float("nan"),
+                "xtx": data["batch_xtx"][i],
+                "xty": data["batch_xty"][i],
+            }))
+        return stats
+
+
+# -------------------------
+# CLI helpers
+# -------------------------
+def read_batch(path, chunk_rows=1_000_000):
+    """Read FEATURES + risk_score from a CSV in the merged_dataset.csv / Final_Dataset.csv schema."""
+    import pandas as pd
+
+    parts = [c.dropna() for c in pd.read_csv(path, usecols=FEATURES + [TARGET], chunksize=chunk_rows)]
+    df = pd.concat(parts, ignore_index=True)
+    return df[FEATURES].to_numpy(dtype=np.float64), df[TARGET].to_numpy(dtype=np.float64)
+
+
+def write_model(stats, model_path):
+    from train_model import save_artifact
+
+    start = time.perf_counter()
+    stats.solve()
+    solve_s = time.perf_counter() - start
+    model = stats.to_model()
+    metadata = {
+        "format": 1,
+        "version": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "model_type": "Ridge",
+        "alpha": stats.alpha,
+        "features": list(FEATURES),
+        "target": TARGET,
+        "training_rows": int(stats.n),
+        "batches": [b for b, _ in stats.batches],
+        "fit_time_s": solve_s,
+        "source": "online_ridge",
+    }
+    save_artifact({"model": model, "metadata": metadata}, model_path, versions_dir=None)
+    stats.save(stats_path_for(model_path))
+    return solve_s
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental ridge updates from sufficient statistics.")
+    parser.add_argument("--model", default=MODEL_PATH, help="model artifact; statistics live next to it")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("init", help="build statistics from a full CSV and write the model")
+    p.add_argument("csv")
+    p.add_argument("--alpha", type=float, default=None, help="default: the current model's alpha")
+    p = sub.add_parser("update", help="fold a new batch of labelled observations in")
+    p.add_argument("csv")
+    p.add_argument("--batch-id", default=None)
+    p = sub.add_parser("rollback", help="remove a batch (the last one by default)")
+    p.add_argument("--batch-id", default=None)
+    sub.add_parser("status", help="show rows and batches folded in")
+    args = parser.parse_args(argv)
+
+    stats_path = stats_path_for(args.model)
+    if getattr(args, "csv", None) and not os.path.exists(args.csv):
+        parser.error(f"CSV not found: {args.csv}")
+    if args.command == "init" and args.alpha is None and not os.path.exists(args.model):
+        parser.error(f"model not found: {args.model} (pass --alpha to start without one)")
+    if args.command != "init" and not os.path.exists(stats_path):
+        parser.error(f"no statistics at {stats_path}; run `online_ridge.py init <csv>` first")
+
+    if args.command == "init":
+        alpha = args.alpha
+        if alpha is None:
+            model, _ = load_artifact(args.model)
+            alpha = float(getattr(model, "alpha", DEFAULT_ALPHA))
+        stats = RidgeStats(alpha=alpha)
+        stats.update(*read_batch(args.csv), batch_id=os.path.basename(args.csv))
+    else:
+        stats = RidgeStats.load(stats_path)
+
+    if args.command == "update":
+        start = time.perf_counter()
+        batch_id = stats.update(*read_batch(args.csv), batch_id=args.batch_id)
+        print(f"Folded in batch {batch_id} in {time.perf_counter() - start:.4f}s")
+    elif args.command == "rollback":
+        try:
+            batch_id = stats.rollback(args.batch_id)
+        except ValueError as e:
+            parser.error(str(e))
+        if not stats.batches:
+            parser.error(f"rolling back {batch_id!r} would leave no observations; nothing was changed")
+        print(f"Rolled back batch {batch_id}")
+
+    if args.command != "status":
+        solve_s = write_model(stats, args.model)
+        print(f"Solved coefficients in {solve_s * 1e6:.0f} µs -> {args.model}, {stats_path}")
+    print(f"{int(stats.n)} rows in {len(stats.batches)} batches (alpha={stats.alpha:g})")
+
+
+if __name__ == "__main__":
+    main()
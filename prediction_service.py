@@ -0,0 +1,277 @@
+import argparse
+import asyncio
+import base64
+import json
+import math
+import time
+
+import numpy as np
+
+from risk_model import FEATURES, MODEL_PATH, alert_levels, load_fast_model, predict_scores
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8502
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT_MS = 2.0
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------
+# Micro-batching queue
+# -------------------------
+class MicroBatcher:
+    """
+    Groups concurrent single-row requests so the model runs one predict per batch.
+    A batch is flushed when it reaches max_batch rows or max_wait_ms after its first row.
+    """
+
+    def __init__(self, model, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, row):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(pending) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # drain anything already queued without waiting
+            while len(pending) < self.max_batch and not self.queue.empty():
+                pending.append(self.queue.get_nowait())
+
+            X = np.array([row for row, _ in pending], dtype=np.float64)
+            try:
+                scores = predict_scores(self.model, X)
+                levels = alert_levels(scores)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += len(pending)
+            for (_, future), score, level in zip(pending, scores, levels):
+                if not future.done():
+                    future.set_result((float(score), level))
+
+
+# -------------------------
+# Request handling
+# -------------------------
+def parse_row(obj):
+    """Pull the five model features out of a JSON object, in FEATURES order."""
+    if not isinstance(obj, dict):
+        raise RequestError(400, "expected a JSON object")
+    missing = [c for c in FEATURES if c not in obj]
+    if missing:
+        raise RequestError(400, f"missing fields: {', '.join(missing)}")
+    try:
+        row = [float(obj[c]) for c in FEATURES]
+    except (TypeError, ValueError):
+        raise RequestError(400, "model fields must be numeric")
+    # float() accepts "nan" / "inf", which would score as NaN (not valid JSON in the response)
+    bad = [c for c, v in zip(FEATURES, row) if not math.isfinite(v)]
+    if bad:
+        raise RequestError(400, f"model fields must be finite: {', '.join(bad)}")
+    return row
+
+
+def content_length(headers):
+    """Body length from the request headers; RequestError if it is malformed or over MAX_BODY_BYTES."""
+    value = headers.get("content-length", "") or "0"
+    try:
+        length = int(value)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise RequestError(400, f"invalid Content-Length: {value[:40]!r}")
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, "request body too large")
+    return length
+
+
+class PredictionService:
+    def __init__(self, model, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.model = model
+        self.batcher = MicroBatcher(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self.started = time.time()
+
+    async def green_index(self, image_bytes):
+        # image work runs off the event loop; cv2 is only imported once an image arrives
+        from green_index import green_percentage_from_bytes
+
+        try:
+            green_percent, _, _ = await asyncio.to_thread(green_percentage_from_bytes, image_bytes)
+        except Exception as e:
+            raise RequestError(400, f"could not process image: {e}")
+        return green_percent
+
+    async def predict(self, body):
+        if not isinstance(body, dict):
+            raise RequestError(400, "expected a JSON object")
+        payload = dict(body)
+        if "image_b64" in payload:
+            try:
+                image_bytes = base64.b64decode(payload.pop("image_b64"), validate=True)
+            except (ValueError, TypeError):
+                raise RequestError(400, "image_b64 is not valid base64")
+            payload["green_index"] = await self.green_index(image_bytes) / 100.0
+        row = parse_row(payload)
+        score, level = await self.batcher.submit(row)
+        return {"risk_score": score, "alert_level": level, "green_index": row[FEATURES.index("green_index")]}
+
+    def predict_batch(self, body):
+        rows = body.get("rows") if isinstance(body, dict) else body
+        if not isinstance(rows, list):
+            raise RequestError(400, "expected {\"rows\": [...]}")
+        if not rows:
+            return {"results": []}
+        X = np.array([parse_row(r) for r in rows], dtype=np.float64)
+        scores = predict_scores(self.model, X)
+        return {"results": [{"risk_score": float(s), "alert_level": a}
+                            for s, a in zip(scores, alert_levels(scores))]}
+
+    def health(self):
+        return {
+            "status": "ok",
+            "uptime_s": time.time() - self.started,
+            "batches": self.batcher.batches,
+            "batched_rows": self.batcher.rows,
+        }
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            return self.health()
+        if method != "POST":
+            raise RequestError(405, f"{method} not allowed on {path}")
+        if path == "/green_index":
+            green_percent = await self.green_index(body)
+            return {"green_percent": green_percent, "green_index": green_percent / 100.0}
+        try:
+            data = json.loads(body or b"null")
+        except ValueError:
+            raise RequestError(400, "body is not valid JSON")
+        if path == "/predict":
+            return await self.predict(data)
+        if path == "/predict_batch":
+            return self.predict_batch(data)
+        raise RequestError(404, f"unknown path {path}")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                length = None
+                try:
+                    length = content_length(headers)
+                    body = await reader.readexactly(length) if length else b""
+                    status, result = 200, await self.route(method, path.split("?", 1)[0], body)
+                except RequestError as e:
+                    status, result = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, result = 500, {"error": str(e)}
+
+                # without a usable length the next request cannot be found in the stream
+                keep_alive = keep_alive and length is not None
+                payload = json.dumps(result).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(model_path=MODEL_PATH, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    service = PredictionService(load_fast_model(model_path), max_batch=max_batch, max_wait_ms=max_wait_ms)
+    service.batcher.start()
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Serving {model_path} on http://{host}:{port} (max_batch={max_batch}, max_wait_ms={max_wait_ms})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.batcher.stop()
+
+
+# -------------------------
+# CLI entry point
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless HTTP scoring service for the ridge risk model.")
+    parser.add_argument("--model", default=MODEL_PATH, help="path to the model pickle")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="rows per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="how long a micro-batch waits for more rows")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.model, args.host, args.port, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
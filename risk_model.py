@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# -------------------------
+# Model constants (shared by app.py and the batch / service entry points)
+# -------------------------
+MODEL_PATH = "ridge_reg.pkl"
+COMPACT_SUFFIX = ".model.json"
+
+# column order the ridge model was fitted on
+FEATURES = [
+    "slope_angle_deg",
+    "factor_of_safety",
+    "green_index",
+    "rainfall_mm_day",
+    "pore_pressure_kpa",
+]
+
+# alert thresholds on the predicted risk score
+LOW_THRESHOLD = 0.21
+HIGH_THRESHOLD = 0.25
+
+ALERT_LEVELS = np.array(["Low", "Medium", "High"])
+NO_LEVEL = -1  # alert_level_codes value for a non-finite score
+ALERT_ICONS = {"Low": "🟢 Low", "Medium": "🟡 Medium", "High": "🔴 High"}
+
+
+def load_artifact(path=MODEL_PATH):
+    """
+    Returns: (model, metadata)
+    Accepts both a bare pickled model and the {"model", "metadata"} artifact written by train_model.py.
+    """
+    import joblib
+
+    obj = joblib.load(path)
+    if isinstance(obj, dict) and "model" in obj:
+        return obj["model"], obj.get("metadata", {})
+    return obj, {}
+
+
+def load_model(path=MODEL_PATH):
+    return load_artifact(path)[0]
+
+
+# -------------------------
+# Compact export + pure-NumPy predictor (no pandas / sklearn / joblib at load time)
+# -------------------------
+class LinearRiskModel:
+    """
+    Coefficients, intercept and feature order of a fitted linear model. Alert levels always use
+    the module thresholds (alert_level_codes), so none are stored per model.
+    """
+
+    def __init__(self, coef, intercept, features=FEATURES, metadata=None, source_sha256=None):
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+        self.features = list(features)
+        self.metadata = metadata or {}
+        self.source_sha256 = source_sha256  # hash of the pickle this was exported from
+        if len(self.coef_) != len(self.features):
+            raise ValueError(f"{len(self.coef_)} coefficients for {len(self.features)} features")
+
+    def predict(self, X):
+        """Accepts an (n, 5) array or anything with the feature columns (e.g. a DataFrame)."""
+        if hasattr(X, "columns"):
+            X = X[self.features].to_numpy(dtype=np.float64)
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+    @classmethod
+    def from_model(cls, model, metadata=None):
+        features = list(getattr(model, "feature_names_in_", FEATURES))
+        return cls(np.ravel(model.coef_), np.ravel(model.intercept_)[0], features, metadata=metadata)
+
+    def to_dict(self):
+        return {
+            "format": 1,
+            "model_type": "linear",
+            "features": self.features,
+            "coef": self.coef_.tolist(),
+            "intercept": self.intercept_,
+            "metadata": self.metadata,
+            "source_sha256": self.source_sha256,
+        }
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            d = json.load(f)
+        return cls(d["coef"], d["intercept"], d["features"], d.get("metadata"), d.get("source_sha256"))
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compact_path_for(model_path=MODEL_PATH):
+    return os.path.splitext(model_path)[0] + COMPACT_SUFFIX
+
+
+def export_compact(model_path=MODEL_PATH, out_path=None):
+    """Write the compact JSON export of a pickled model. Returns the output path."""
+    model, metadata = load_artifact(model_path)
+    out_path = out_path or compact_path_for(model_path)
+    compact = LinearRiskModel.from_model(model, metadata)
+    compact.source_sha256 = file_sha256(model_path)
+    compact.save(out_path)
+    return out_path
+
+
+def load_fast_model(model_path=MODEL_PATH):
+    """
+    Load the compact export next to model_path when it was exported from the pickle as it is
+    now (matching content hash); otherwise fall back to unpickling the full model.
+    """
+    compact_path = compact_path_for(model_path)
+    if os.path.exists(compact_path):
+        compact = LinearRiskModel.load(compact_path)
+        if not os.path.exists(model_path) or compact.source_sha256 == file_sha256(model_path):
+            return compact
+    return load_model(model_path)
+
+
+def artifact_alpha(model_path=MODEL_PATH):
+    """
+    Ridge regularisation the model at model_path was trained with: metadata["alpha"] of the
+    artifact (train_model.py records the cross-validated value), else the fitted estimator's
+    own alpha (bare pickled Ridge). None when neither is available.
+    """
+    compact_path = compact_path_for(model_path)
+    if os.path.exists(compact_path):
+        compact = LinearRiskModel.load(compact_path)
+        if compact.source_sha256 == file_sha256(model_path) and "alpha" in compact.metadata:
+            return float(compact.metadata["alpha"])
+    model, metadata = load_artifact(model_path)
+    alpha = metadata.get("alpha", getattr(model, "alpha", None))
+    return None if alpha is None else float(alpha)
+
+
+def predict_scores(model, X):
+    """
+    Input: fitted model, X as (n, 5) array in FEATURES order
+    Returns: risk scores as a float64 (n,) array
+    Linear models are evaluated as a single X @ coef + intercept product.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    coef = getattr(model, "coef_", None)
+    if coef is not None:
+        return X @ np.ravel(coef) + float(np.ravel(getattr(model, "intercept_", 0.0))[0])
+    import pandas as pd
+
+    return np.asarray(model.predict(pd.DataFrame(X, columns=FEATURES)), dtype=np.float64)
+
+
+def alert_level_codes(scores):
+    """
+    Vectorized alert levels: 0 = Low (< LOW_THRESHOLD), 1 = Medium (LOW_THRESHOLD..HIGH_THRESHOLD
+    inclusive), 2 = High, NO_LEVEL for NaN/inf scores (rows with missing inputs).
+    The app's original if/elif sent a score of exactly LOW_THRESHOLD to High.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    codes = np.full(scores.shape, NO_LEVEL, dtype=np.int8)
+    codes[(scores > HIGH_THRESHOLD) & np.isfinite(scores)] = 2
+    codes[(scores >= LOW_THRESHOLD) & (scores <= HIGH_THRESHOLD)] = 1
+    codes[(scores < LOW_THRESHOLD) & np.isfinite(scores)] = 0
+    return codes
+
+
+def alert_level_names(codes):
+    """Level names for alert_level_codes output (object array, None for NO_LEVEL)."""
+    codes = np.asarray(codes)
+    names = ALERT_LEVELS.astype(object)[np.maximum(codes, 0)]
+    names[codes < 0] = None
+    return names
+
+
+def alert_levels(scores):
+    return alert_level_names(alert_level_codes(scores))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export a pickled model to the compact JSON format.")
+    parser.add_argument("model", nargs="?", default=MODEL_PATH)
+    parser.add_argument("-o", "--output", default=None, help=f"default: <model>{COMPACT_SUFFIX}")
+    args = parser.parse_args()
+    print(f"{args.model} -> {export_compact(args.model, args.output)}")
@@ -0,0 +1,215 @@
+import argparse
+import time
+
+import numpy as np
+
+from risk_model import ALERT_LEVELS, FEATURES, HIGH_THRESHOLD, LOW_THRESHOLD, MODEL_PATH, alert_level_codes, \
+    load_fast_model, predict_scores
+
+# bounds of the app's inputs (green_index is a fraction)
+INPUT_RANGES = {
+    "slope_angle_deg": (0.0, 90.0),
+    "factor_of_safety": (0.0, 10.0),
+    "green_index": (0.0, 1.0),
+    "rainfall_mm_day": (0.0, 5000.0),
+    "pore_pressure_kpa": (0.0, 5000.0),
+}
+
+# where almost all real queries fall (merged_dataset.csv stays well inside these)
+DEFAULT_ENVELOPE = {
+    "slope_angle_deg": (0.0, 90.0),
+    "factor_of_safety": (0.0, 5.0),
+    "green_index": (0.0, 1.0),
+    "rainfall_mm_day": (0.0, 200.0),
+    "pore_pressure_kpa": (0.0, 200.0),
+}
+
+FEATURE_LABELS = {
+    "slope_angle_deg": "Slope angle (deg)",
+    "factor_of_safety": "Factor of Safety",
+    "green_index": "Green index (fraction)",
+    "rainfall_mm_day": "Rainfall (mm/day)",
+    "pore_pressure_kpa": "Pore Pressure (kPa)",
+}
+
+
+# -------------------------
+# Risk surfaces: score many inputs around one operating point
+# -------------------------
+class LinearRiskSurface:
+    """
+    Exact closed form for linear models: moving one feature by d moves the score by coef * d,
+    so sweeps are a single vector op and alert-level boundaries are solved directly.
+    """
+
+    def __init__(self, model):
+        self.coef = np.ravel(model.coef_).astype(np.float64)
+        self.intercept = float(np.ravel(getattr(model, "intercept_", 0.0))[0])
+
+    def scores(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+    def sweep(self, base, feature, values):
+        """Scores with `feature` set to each of `values` and the other features held at `base`."""
+        j = FEATURES.index(feature)
+        base = np.asarray(base, dtype=np.float64)
+        return self.scores(base) + self.coef[j] * (np.asarray(values, dtype=np.float64) - base[j])
+
+    def crossings(self, base, feature, lo, hi):
+        """Values of `feature` in (lo, hi) where the score hits an alert threshold."""
+        j = FEATURES.index(feature)
+        if self.coef[j] == 0:
+            return np.array([])
+        at = float(np.asarray(base, dtype=np.float64)[j])
+        points = at + (np.array([LOW_THRESHOLD, HIGH_THRESHOLD]) - self.scores(base)) / self.coef[j]
+        return np.sort(points[(points > lo) & (points < hi)])
+
+
+class GridRiskSurface:
+    """
+    Any model, evaluated once on a dense regular grid over the operating envelope and
+    multilinearly interpolated. Inputs outside the envelope fall back to the model itself.
+    """
+
+    def __init__(self, model, envelope=None, points=9):
+        from scipy.interpolate import RegularGridInterpolator
+
+        self.model = model
+        self.envelope = dict(DEFAULT_ENVELOPE, **(envelope or {}))
+        axes = [np.linspace(*self.envelope[f], points) for f in FEATURES]
+        mesh = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, len(FEATURES))
+        values = predict_scores(model, mesh).reshape([points] * len(FEATURES))
+        self.lower = np.array([a[0] for a in axes])
+        self.upper = np.array([a[-1] for a in axes])
+        self.interpolate = RegularGridInterpolator(axes, values)
+
+    def scores(self, X):
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        inside = ((X >= self.lower) & (X <= self.upper)).all(axis=1)
+        out = np.empty(len(X))
+        if inside.any():
+            out[inside] = self.interpolate(X[inside])
+        if (~inside).any():
+            out[~inside] = predict_scores(self.model, X[~inside])
+        return out
+
+    def sweep(self, base, feature, values):
+        values = np.asarray(values, dtype=np.float64)
+        X = np.repeat(np.asarray(base, dtype=np.float64)[None, :], len(values), axis=0)
+        X[:, FEATURES.index(feature)] = values
+        return self.scores(X)
+
+    def crossings(self, base, feature, lo, hi, samples=2001):
+        """Threshold crossings located on a fine sweep, refined by linear interpolation."""
+        values = np.linspace(lo, hi, samples)
+        scores = self.sweep(base, feature, values)
+        points = []
+        for threshold in (LOW_THRESHOLD, HIGH_THRESHOLD):
+            d = scores - threshold
+            for i in np.flatnonzero(np.sign(d[:-1]) != np.sign(d[1:])):
+                t = d[i] / (d[i] - d[i + 1]) if d[i] != d[i + 1] else 0.0
+                points.append(values[i] + t * (values[i + 1] - values[i]))
+        points = np.array(points)
+        return np.sort(points[(points > lo) & (points < hi)])
+
+
+def risk_surface_for(model, envelope=None, points=9):
+    """Closed form for linear models, interpolated grid otherwise."""
+    if getattr(model, "coef_", None) is not None:
+        return LinearRiskSurface(model)
+    return GridRiskSurface(model, envelope, points)
+
+
+# -------------------------
+# Region of interest: which inputs flip the alert level
+# -------------------------
+def level_ranges(surface, base, feature, lo=None, hi=None):
+    """
+    Split [lo, hi] of one feature (others held at `base`) into alert-level segments.
+    Returns: list of (level, start, end); boundaries are where the score equals a threshold.
+    """
+    default_lo, default_hi = INPUT_RANGES[feature]
+    lo = default_lo if lo is None else lo
+    hi = default_hi if hi is None else hi
+    edges = np.concatenate([[lo], surface.crossings(base, feature, lo, hi), [hi]])
+    mids = (edges[:-1] + edges[1:]) / 2
+    codes = alert_level_codes(surface.sweep(base, feature, mids))
+    segments = []
+    for code, start, end in zip(codes, edges[:-1], edges[1:]):
+        level = str(ALERT_LEVELS[code])
+        if segments and segments[-1][0] == level:
+            segments[-1] = (level, segments[-1][1], float(end))
+        else:
+            segments.append((level, float(start), float(end)))
+    return segments
+
+
+def _first_value_in(surface, base, feature, level, value, toward):
+    """
+    Nudge a segment boundary toward `toward` (the segment's other end) until its score is
+    classed as `level`: Low and High exclude their threshold, so the boundary itself is not enough.
+    """
+    step = np.spacing(abs(value)) or np.finfo(np.float64).tiny
+    direction = 1.0 if toward > value else -1.0
+    while str(ALERT_LEVELS[alert_level_codes(surface.sweep(base, feature, [value]))[0]]) != level:
+        nxt = value + direction * step
+        if (nxt - toward) * direction > 0:
+            return toward
+        value, step = nxt, step * 2
+    return value
+
+
+def change_to_reach(surface, base, feature, level, lo=None, hi=None):
+    """
+    Smallest signed change of `feature` (from its value in `base`) that puts the
+    score in `level` (just past the threshold where that level excludes it);
+    0 if it already is, None if no value in range does.
+    """
+    at = float(np.asarray(base, dtype=np.float64)[FEATURES.index(feature)])
+    best = None
+    for seg_level, start, end in level_ranges(surface, base, feature, lo, hi):
+        if seg_level != level:
+            continue
+        if start <= at <= end:
+            return 0.0
+        if start > at:
+            delta = _first_value_in(surface, base, feature, level, start, end) - at
+        else:
+            delta = _first_value_in(surface, base, feature, level, end, start) - at
+        if best is None or abs(delta) < abs(best):
+            best = delta
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="What-if alert levels around one operating point.")
+    parser.add_argument("--slope", type=float, default=30.0)
+    parser.add_argument("--fos", type=float, default=1.2)
+    parser.add_argument("--green", type=float, default=0.5, help="green index as a fraction")
+    parser.add_argument("--rainfall", type=float, default=12.5)
+    parser.add_argument("--pore", type=float, default=22.0)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--grid", action="store_true", help="use the interpolated grid even for linear models")
+    parser.add_argument("--points", type=int, default=9, help="grid points per feature")
+    args = parser.parse_args(argv)
+
+    model = load_fast_model(args.model)
+    start = time.perf_counter()
+    surface = GridRiskSurface(model, points=args.points) if args.grid else risk_surface_for(model)
+    built = time.perf_counter() - start
+    base = np.array([args.slope, args.fos, args.green, args.rainfall, args.pore])
+    score = float(surface.scores(base[None, :])[0])
+    print(f"score {score:.4f} ({ALERT_LEVELS[alert_level_codes([score])[0]]}), "
+          f"{type(surface).__name__} built in {built * 1000:.1f} ms")
+    for feature in FEATURES:
+        start = time.perf_counter()
+        segments = level_ranges(surface, base, feature)
+        to_high = change_to_reach(surface, base, feature, "High")
+        elapsed = time.perf_counter() - start
+        spans = ", ".join(f"{level} {a:g}..{b:g}" for level, a, b in segments)
+        reach = "n/a" if to_high is None else f"{to_high:+.3f}"
+        print(f"{feature:<20} {spans}  | to High: {reach}  ({elapsed * 1000:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
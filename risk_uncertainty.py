@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from risk_model import FEATURES, HIGH_THRESHOLD, LOW_THRESHOLD, MODEL_PATH, artifact_alpha, file_sha256, \
+    load_fast_model
+
+UNCERTAINTY_SUFFIX = ".uncertainty.json"
+DEFAULT_INTERVAL = 0.90
+PREDICT_CHUNK_ROWS = 65_536
+UNCERTAINTY_COLUMNS = ["risk_score_lo", "risk_score_hi", "p_low", "p_medium", "p_high"]
+
+
+def uncertainty_path_for(model_path=MODEL_PATH):
+    return os.path.splitext(model_path)[0] + UNCERTAINTY_SUFFIX
+
+
+# -------------------------
+# Analytic prediction intervals for the ridge model
+# -------------------------
+class RidgeUncertainty:
+    """
+    Score distribution for a linear model fitted by ridge regression:
+        score(x) ~ Normal(x·coef + b, s²(x)),  s²(x) = σ²(1 + 1/n) + (x - x̄)ᵀ C (x - x̄)
+    σ² is the residual variance of the deployed coefficients on the training data and
+    C = σ² A⁻¹ XcᵀXc A⁻¹ (A = XcᵀXc + αI) the ridge coefficient covariance, both from the
+    sufficient statistics in online_ridge.RidgeStats. Scoring a batch costs two small
+    matrix products, a few elementwise ops and three normal CDFs.
+    """
+
+    def __init__(self, coef, intercept, mean_x, cov_coef, sigma2, n, source_sha256=None):
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.mean_x = np.asarray(mean_x, dtype=np.float64)
+        self.cov_coef = np.asarray(cov_coef, dtype=np.float64)
+        self.sigma2 = float(sigma2)
+        self.n = float(n)
+        self.source_sha256 = source_sha256
+        # C = L Lᵀ, so (x - x̄)ᵀ C (x - x̄) = |(x - x̄) L|²
+        self._chol = np.linalg.cholesky(self.cov_coef + 1e-18 * np.eye(len(self.coef)))
+
+    @classmethod
+    def from_stats(cls, stats, model=None, source_sha256=None):
+        """stats: RidgeStats over the training data; model: deployed coefficients (default: stats.solve())."""
+        if not np.isfinite(stats.sum_yy):
+            raise ValueError("statistics were saved without yᵀy; rebuild them with `online_ridge.py init`")
+        if model is None:
+            coef, intercept = stats.solve()
+        else:
+            coef = np.ravel(model.coef_).astype(np.float64)
+            intercept = float(np.ravel(model.intercept_)[0])
+        n = stats.n
+        p = len(coef)
+        mean_x = stats.sum_x / n
+        xtx_c = stats.xtx - n * np.outer(mean_x, mean_x)
+        # residual sum of squares of (coef, intercept), expanded over the sufficient statistics
+        rss = (stats.sum_yy - 2 * coef @ stats.xty - 2 * intercept * stats.sum_y + coef @ stats.xtx @ coef
+               + 2 * intercept * coef @ stats.sum_x + n * intercept ** 2)
+        sigma2 = max(rss, 0.0) / max(n - p - 1, 1.0)
+        a_inv = np.linalg.inv(xtx_c + stats.alpha * np.eye(p))
+        cov_coef = sigma2 * a_inv @ xtx_c @ a_inv
+        return cls(coef, intercept, mean_x, (cov_coef + cov_coef.T) / 2, sigma2, n, source_sha256)
+
+    def predict(self, X, interval=DEFAULT_INTERVAL, chunk_rows=PREDICT_CHUNK_ROWS):
+        """
+        X: (n, 5) array in FEATURES order.
+        Returns: dict of (n,) arrays: risk_score, std, risk_score_lo/hi (central `interval`),
+        p_low / p_medium / p_high (same boundaries as risk_model.alert_level_codes).
+        """
+        from scipy.special import ndtr, ndtri
+
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        n = len(X)
+        out = {name: np.empty(n) for name in ("risk_score", "std") + tuple(UNCERTAINTY_COLUMNS)}
+        z = ndtri(0.5 + interval / 2)
+        noise = self.sigma2 * (1.0 + 1.0 / self.n)
+        # one product gives the score (column 0) and (x - x̄) L (the rest, after the offset)
+        weights = np.column_stack([self.coef, self._chol])
+        offset = np.concatenate([[-self.intercept], self.mean_x @ self._chol])
+        # chunks keep the temporaries in cache; the per-row work is the same
+        for start in range(0, n, chunk_rows):
+            rows = slice(start, start + chunk_rows)
+            proj = X[rows] @ weights
+            proj -= offset
+            score = out["risk_score"][rows]
+            score[:] = proj[:, 0]
+            d = proj[:, 1:]
+            std = out["std"][rows]
+            np.einsum("ij,ij->i", d, d, out=std)
+            std += noise
+            np.sqrt(std, out=std)
+            np.multiply(std, -z, out=out["risk_score_lo"][rows])
+            out["risk_score_lo"][rows] += score
+            np.multiply(std, z, out=out["risk_score_hi"][rows])
+            out["risk_score_hi"][rows] += score
+            p_low = out["p_low"][rows]
+            p_high = out["p_high"][rows]
+            ndtr((LOW_THRESHOLD - score) / std, out=p_low)
+            ndtr((score - HIGH_THRESHOLD) / std, out=p_high)
+            p_medium = out["p_medium"][rows]
+            np.subtract(1.0, p_low, out=p_medium)
+            p_medium -= p_high
+            np.clip(p_medium, 0.0, 1.0, out=p_medium)
+        return out
+
+    # -------------------------
+    # Persistence (JSON next to the model, like the compact export)
+    # -------------------------
+    def to_dict(self):
+        return {
+            "format": 1,
+            "features": list(FEATURES),
+            "coef": self.coef.tolist(),
+            "intercept": self.intercept,
+            "mean_x": self.mean_x.tolist(),
+            "cov_coef": self.cov_coef.tolist(),
+            "sigma2": self.sigma2,
+            "n": self.n,
+            "source_sha256": self.source_sha256,
+        }
+
+    def save(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            d = json.load(f)
+        return cls(d["coef"], d["intercept"], d["mean_x"], d["cov_coef"], d["sigma2"], d["n"], d.get("source_sha256"))
+
+
+def load_uncertainty(model_path=MODEL_PATH):
+    """The stored intervals for model_path, or None if missing or fitted for a different model file."""
+    path = uncertainty_path_for(model_path)
+    if not os.path.exists(path):
+        return None
+    unc = RidgeUncertainty.load(path)
+    if os.path.exists(model_path) and unc.source_sha256 != file_sha256(model_path):
+        return None
+    return unc
+
+
+def fit(data_path, model_path=MODEL_PATH, alpha=None):
+    """
+    Fold the training data into RidgeStats and derive intervals for the deployed coefficients.
+    alpha: overrides the regularisation recorded with the model (required if none is).
+    """
+    from online_ridge import RidgeStats, read_batch
+
+    if alpha is None:
+        alpha = artifact_alpha(model_path)
+        if alpha is None:
+            raise ValueError(f"{model_path} records no ridge alpha; pass the one it was trained with (--alpha)")
+    model = load_fast_model(model_path)
+    X, y = read_batch(data_path)
+    stats = RidgeStats(alpha=alpha)
+    stats.update(X, y, batch_id=os.path.basename(data_path))
+    unc = RidgeUncertainty.from_stats(stats, model, file_sha256(model_path))
+    return unc, X, y
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit analytic prediction intervals for the ridge model.")
+    parser.add_argument("data", nargs="?", default="Final_Dataset.csv", help="training CSV")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--alpha", type=float, default=None, help="override the ridge alpha recorded with the model")
+    parser.add_argument("-o", "--output", default=None, help=f"default: <model>{UNCERTAINTY_SUFFIX}")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        unc, X, y = fit(args.data, args.model, args.alpha)
+    except ValueError as e:
+        parser.error(str(e))
+    out = args.output or uncertainty_path_for(args.model)
+    unc.save(out)
+    pred = unc.predict(X)
+    covered = np.mean((y >= pred["risk_score_lo"]) & (y <= pred["risk_score_hi"]))
+    print(f"sigma {np.sqrt(unc.sigma2):.5f} from {int(unc.n)} rows in {time.perf_counter() - start:.2f}s -> {out}")
+    print(f"{DEFAULT_INTERVAL:.0%} interval covers {covered:.1%} of the training targets")
+
+
+if __name__ == "__main__":
+    main()
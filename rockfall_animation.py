@@ -1,34 +1,19 @@
-import pygame
-import pandas as pd
+import argparse
+import os
 import random
 import textwrap
 import time
-import math
 
-data = pd.read_csv("dataset.csv")
-sampled_data = pd.concat([
-    data[data["alert_level"] == "Low"].sample(min(40, len(data[data["alert_level"] == "Low"])), replace=True),
-    data[data["alert_level"] == "Medium"].sample(min(30, len(data[data["alert_level"] == "Medium"])), replace=True),
-    data[data["alert_level"] == "High"].sample(min(20, len(data[data["alert_level"] == "High"])), replace=True)
-])
+import numpy as np
+import pygame
 
+from data_store import load_dataset
+from rockfall_sim import DEFAULT_DATA, DEFAULT_SAMPLE_COUNTS, DT, HEIGHT, HOUSES, SAMPLE_COLUMNS, WIDTH, build_sim
 
-pygame.init()
-WIDTH, HEIGHT = 1000, 600
 SIDEBAR = 350
-GROUND = HEIGHT - 70
-LEFT_MARGIN = 150   # Reserve space for legend
-
-screen = pygame.display.set_mode((WIDTH + SIDEBAR, HEIGHT))
-pygame.display.set_caption("Rockfall Simulation - Hackathon Demo")
-clock = pygame.time.Clock()
-
-font = pygame.font.SysFont("Arial", 22)
-big_font = pygame.font.SysFont("Arial", 44, bold=True)
-
 
 
-def draw_legend(surface):
+def draw_legend(surface, font):
     legend_x = 10
     legend_y = 20
     spacing = 40
@@ -87,203 +72,360 @@ def draw_house(surface, x, y):
     pygame.draw.rect(surface, (0,0,0), window2, 2)
 
 
-rocks = []
-peak_x = WIDTH // 2
-peak_y = 80
-base_y = 180
-width_factor = 400  # horizontal spread
-
-for _ in range(2):  # more rocks
-    for idx, row in sampled_data.iterrows():
-        x = random.randint(peak_x - width_factor, peak_x + width_factor)
-        # Ensure rock doesn't spawn inside LEFT_MARGIN
-        if x < LEFT_MARGIN:
-            x = LEFT_MARGIN + random.randint(0, width_factor//2)
-        curve_a = (base_y - peak_y) / (width_factor**2)
-        target_y = peak_y + int(curve_a * (x - peak_x)**2)
-        final_size = random.randint(30,50)
-        rocks.append({
-            "x": x,
-            "y": target_y,
-            "size": 0,          # pop-up animation
-            "target_size": final_size,
-            "alert": row["alert_level"],
-            "row": row,
-            "falling": False,
-            "paused": False,
-            "velocity": 0,
-            "warned": False,
-            "shake_offset": 0,
-            "shake_dir": 1,
-            "alert_time": None,
-            "alert_shown": False,
-            "alert_display": False,
-            "people_time": None,
-            "crack_level": 0
-        })
-
-houses = [(200, HEIGHT-170), (450, HEIGHT-170), (700, HEIGHT-170)]
-people = []
-warnings = []
-
-life_saved = False
-life_saved_started = False
-life_saved_scale = 0.1
-step_count = 0
-
-def spawn_people():
-    new_people = []
-    for hx, hy in houses:
-        for j in range(3):
-            new_people.append({
-                "x": hx + 40 + j*10,
-                "y": hy + 60,
-                "running": False,
-                "dir": random.choice([-1, 1]),
-                "escaped": False
-            })
-    return new_people
-
-def draw_cracked_rock(surface, rock):
-    x, y, size = int(rock["x"] + rock["shake_offset"]), int(rock["y"]), rock["size"]
-    if rock["crack_level"] == 0:
-        color = (210,180,140)
-    elif rock["crack_level"] == 1:
-        color = (160,82,45)
-    elif rock["crack_level"] == 2:
-        color = (139,69,19)
-    else:
-        color = (200,0,0)
-    pygame.draw.rect(surface, color, (x, y, size, size))
-    pygame.draw.rect(surface, (0,0,0), (x, y, size, size), 2)
-    for i in range(rock["crack_level"]):
-        start_pos = (x + random.randint(0,size), y + random.randint(0,size))
-        end_pos = (x + random.randint(0,size), y + random.randint(0,size))
-        pygame.draw.line(surface, (0,0,0), start_pos, end_pos, 2)
-
-
-running = True
-while running:
-    step_count += 1
-    screen.fill((140, 178, 255))  # sky
-    pygame.draw.ellipse(screen, (34, 139, 34), (0, HEIGHT - 120, WIDTH, 200))
-    pygame.draw.rect(screen, (71, 60, 51), (0, HEIGHT - 70, WIDTH, 70))
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-
-    draw_legend(screen)
-
-
-    for hx, hy in houses:
-        draw_house(screen, hx, hy)
-
-
-    for rock in rocks:
-        if rock["size"] < rock["target_size"]:
-            rock["size"] += 1
-        if not rock["falling"] and random.random() < 0.001:
-            if rock["crack_level"] < 3:
-                rock["crack_level"] += 1
-        if rock["crack_level"] == 3 and not rock["falling"] and not rock["warned"]:
-            rock["falling"] = True
-            rock["velocity"] = 4
-            rock["paused"] = True
-            rock["alert_time"] = time.time()
-            rock["alert_shown"] = True
-            rock["alert_display"] = True
-            rock["people_time"] = time.time()
-        if rock["paused"]:
-            rock["shake_offset"] += rock["shake_dir"] * 1.5
-            if abs(rock["shake_offset"]) > 6:
-                rock["shake_dir"] *= -1
-        if rock["falling"] or rock["paused"]:
-            if rock["crack_level"] == 3:
-                pygame.draw.circle(screen, (255, 255, 0),
-                                   (int(rock["x"] + rock["size"]//2), int(rock["y"] + rock["size"]//2)), 60, 4)
-        if rock["falling"] and not rock["paused"]:
-            rock["velocity"] += 0.4
-            rock["y"] += rock["velocity"]
-            if rock["y"] >= GROUND:
-                rock["y"] = GROUND
-                rock["falling"] = False
-                if not rock["warned"]:
-                    rock["warned"] = True
-                    row = rock["row"]
-                    details = f"Rockfall at Location {row['location_id']} | Region: {row['region']} | FoS: {float(row['factor_of_safety']):.2f}"
-                    warnings.append(details)
-                    rock["alert_display"] = False
-                    if not life_saved_started:
-                        life_saved = True
-                        life_saved_started = True
-        draw_cracked_rock(screen, rock)
-
-
-    if any(r["alert_display"] for r in rocks):
-        for rock in rocks:
-            if rock["people_time"] and time.time() - rock["people_time"] >= 1:
-                if not people:
-                    people = spawn_people()
-                for p in people:
-                    p["running"] = True
-
-    all_escaped = True
-    for p in people:
-        if p["running"] and not p["escaped"]:
-            p["x"] += p["dir"] * 5
-            draw_person(screen, int(p["x"]), int(p["y"]), step_count)
-            if not (0 < p["x"] < WIDTH):
-                p["escaped"] = True
-        elif not p["escaped"]:
-            draw_person(screen, int(p["x"]), int(p["y"]), step_count)
-            all_escaped = False
-        if not p["escaped"]:
-            all_escaped = False
-
-    if all_escaped and people:
-        for rock in rocks:
-            if rock["paused"]:
-                rock["paused"] = False
-
-    if any(r["alert_display"] for r in rocks):
-        alert_text = big_font.render("ROCKFALL ALERT!", True, (255,0,0))
-        padding_x, padding_y = 20, 10
-        rect_w = alert_text.get_width() + 2*padding_x
-        rect_h = alert_text.get_height() + 2*padding_y
-        rect_x = WIDTH//2 - rect_w//2
-        rect_y = 10
-        pygame.draw.rect(screen, (255, 150, 150), (rect_x, rect_y, rect_w, rect_h), border_radius=12)
-        screen.blit(alert_text, (WIDTH//2 - alert_text.get_width()//2, rect_y + padding_y))
-
-
-    pygame.draw.rect(screen, (50,50,50), (WIDTH,0,SIDEBAR,HEIGHT))
-    title = font.render("Rockfall Reports", True, (255,255,255))
-    screen.blit(title, (WIDTH+20, 20))
-    y_offset = 60
-    for msg in warnings[-8:]:
-        wrapped = textwrap.wrap(msg, width=35)
-        for line in wrapped:
-            text_surface = font.render(line, True, (255,200,200))
-            screen.blit(text_surface, (WIDTH + 20, y_offset))
-            y_offset += 26
-        y_offset += 10
-
-
-    if life_saved:
-        life_saved_scale += 0.05
-        if life_saved_scale > 1.0:
-            life_saved_scale = 1.0
-        rect_w = int(280 * life_saved_scale)
-        rect_h = int(64 * life_saved_scale)
-        rect_x = WIDTH//2 - rect_w//2
-        rect_y = HEIGHT//2 - rect_h//2
-        pygame.draw.rect(screen, (220, 255, 210), (rect_x, rect_y, rect_w, rect_h), border_radius=22)
-        msg = big_font.render("Life Saved!", True, (0,180,0))
-        screen.blit(msg, (WIDTH//2 - msg.get_width()//2, HEIGHT//2 - msg.get_height()//2))
-
-    pygame.display.flip()
-    clock.tick(30)
-
-pygame.quit()
+CRACK_COLORS = [(210,180,140), (160,82,45), (139,69,19), (200,0,0)]
+CRACK_VARIANTS = 8  # distinct crack patterns; rock i uses pattern i % CRACK_VARIANTS
+HALO_RADIUS = 60
+HALO_COLORKEY = (255, 0, 255)
+REPORT_LINES_CACHE = 256
+TILE = 40  # dirty regions are tracked on a grid of TILE x TILE pixel tiles
+FULL_REPAINT_SHARE = 0.5  # past this share of dirty tiles one full scene repaint is cheaper
+
+
+class LayeredRenderer:
+    """
+    Draws the animation in layers and pushes only the regions that changed to the display:
+    - background: sky, ground, legend, houses and the empty sidebar, drawn once to a cached surface
+    - rocks: one pre-rendered sprite per (size, crack level, pattern) and one halo sprite, drawn
+      with Surface.blits; only tile bands touched by a moving rock (or person, or overlay) are
+      restored and redrawn, so still rocks stay as they are on the screen surface
+    - people, overlays: redrawn every frame on top
+    - sidebar: rebuilt from cached text surfaces only when a new report arrives
+    Per-layer time is accumulated in `timings` (see report()).
+    """
+
+    LAYERS = ("restore", "rocks", "people", "overlays", "sidebar", "present")
+
+    def __init__(self, screen, font, big_font, rand, max_reports=8, full_redraw=False):
+        self.screen = screen
+        self.font = font
+        self.rand = rand
+        self.max_reports = max_reports
+        self.full_redraw = full_redraw
+        self.scene = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        self.sidebar = pygame.Rect(WIDTH, 0, SIDEBAR, HEIGHT)
+        self.background = self._build_background()
+        self.alert_text = big_font.render("ROCKFALL ALERT!", True, (255,0,0))
+        self.saved_text = big_font.render("Life Saved!", True, (0,180,0))
+        self.report_lines = {}  # message -> rendered wrapped lines
+        self.crack_lines = {}  # crack pattern -> line endpoints as fractions of the rock size
+        self.sprites = {}  # sprite key (see _sprite_keys) -> rendered rock
+        self.halo = self._build_halo()
+        self.tiles_shape = (-(-HEIGHT // TILE), -(-WIDTH // TILE))
+        self.life_saved_scale = 0.1
+        self.timings = dict.fromkeys(self.LAYERS, 0.0)
+        self.frames = 0
+        self.invalidate()
+
+    def _build_background(self):
+        surface = pygame.Surface(self.screen.get_size()).convert()
+        surface.fill((140, 178, 255))  # sky
+        pygame.draw.ellipse(surface, (34, 139, 34), (0, HEIGHT - 120, WIDTH, 200))
+        pygame.draw.rect(surface, (71, 60, 51), (0, HEIGHT - 70, WIDTH, 70))
+        draw_legend(surface, self.font)
+        for hx, hy in HOUSES:
+            draw_house(surface, hx, hy)
+        pygame.draw.rect(surface, (50,50,50), self.sidebar)
+        surface.blit(self.font.render("Rockfall Reports", True, (255,255,255)), (WIDTH+20, 20))
+        return surface
+
+    def _build_halo(self):
+        surface = pygame.Surface((2 * HALO_RADIUS + 1, 2 * HALO_RADIUS + 1)).convert()
+        surface.fill(HALO_COLORKEY)
+        surface.set_colorkey(HALO_COLORKEY)
+        pygame.draw.circle(surface, (255, 255, 0), (HALO_RADIUS, HALO_RADIUS), HALO_RADIUS, 4)
+        return surface
+
+    def invalidate(self):
+        """Force a full repaint on the next frame (first frame, window exposed)."""
+        self.full_frame = True
+        self.prev_rocks = None
+        self.prev_boxes = None
+        self.prev_people = []
+        self.prev_overlays = []
+        self.shown_reports = None
+
+    # -------------------------
+    # Layers
+    # -------------------------
+    def _rock_state(self, sim):
+        xs = (sim.x + sim.shake_offset).astype(int)
+        ys = sim.y.astype(int)
+        sizes = sim.size.astype(int)
+        # warning halo around rocks that are about to fall or falling
+        halo = (sim.falling | sim.paused) & (sim.crack_level == 3)
+        cx = (sim.x + sizes // 2).astype(int)
+        cy = (sim.y + sizes // 2).astype(int)
+        return xs, ys, sizes, sim.crack_level.astype(int), halo, cx, cy
+
+    @staticmethod
+    def _rock_boxes(state):
+        """(n, 4) array of x0, y0, x1, y1 covering each rock, its halo and its outline."""
+        xs, ys, sizes, _, halo, cx, cy = state
+        boxes = np.stack([xs, ys, xs + sizes, ys + sizes], axis=1)
+        if halo.any():
+            ring = np.stack([cx - HALO_RADIUS, cy - HALO_RADIUS, cx + HALO_RADIUS + 1, cy + HALO_RADIUS + 1],
+                            axis=1)[halo]
+            boxes[halo, :2] = np.minimum(boxes[halo, :2], ring[:, :2])
+            boxes[halo, 2:] = np.maximum(boxes[halo, 2:], ring[:, 2:])
+        boxes[:, :2] -= 2  # line widths can spill past the outline
+        boxes[:, 2:] += 2
+        return boxes
+
+    def _dirty_tiles(self, boxes):
+        """Boolean (rows, cols) grid of the tiles touched by any of the x0, y0, x1, y1 boxes."""
+        rows, cols = self.tiles_shape
+        tx0 = np.clip(boxes[:, 0] // TILE, 0, cols)
+        ty0 = np.clip(boxes[:, 1] // TILE, 0, rows)
+        tx1 = np.clip((boxes[:, 2] - 1) // TILE + 1, 0, cols)
+        ty1 = np.clip((boxes[:, 3] - 1) // TILE + 1, 0, rows)
+        # 2-D difference array: +1/-1 at the box corners, then a cumulative sum along both axes
+        def corners(ty, tx):
+            return np.bincount(ty * (cols + 1) + tx, minlength=(rows + 1) * (cols + 1))
+
+        diff = corners(ty0, tx0) - corners(ty0, tx1) - corners(ty1, tx0) + corners(ty1, tx1)
+        return diff.reshape(rows + 1, cols + 1).cumsum(axis=0).cumsum(axis=1)[:rows, :cols] > 0
+
+    def _bands(self, tiles):
+        """
+        One rect per run of consecutive tile rows with dirty tiles, spanning their first to last
+        dirty column (a rock crossing several dirty rows is then blitted once, not once per row).
+        """
+        bands = []
+        rows = np.flatnonzero(tiles.any(axis=1))
+        for run in np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1) if len(rows) else []:
+            cols = np.flatnonzero(tiles[run].any(axis=0))
+            band = pygame.Rect(int(cols[0]) * TILE, int(run[0]) * TILE,
+                               (int(cols[-1]) + 1 - int(cols[0])) * TILE, len(run) * TILE)
+            bands.append(band.clip(self.scene))
+        return bands
+
+    @staticmethod
+    def _sprite_keys(state, idx):
+        _, _, sizes, cracks, _, _, _ = state
+        return ((sizes[idx] * len(CRACK_COLORS) + cracks[idx]) * CRACK_VARIANTS + idx % CRACK_VARIANTS).tolist()
+
+    def _make_sprite(self, key):
+        rest, variant = divmod(key, CRACK_VARIANTS)
+        size, crack = divmod(rest, len(CRACK_COLORS))
+        surface = pygame.Surface((size, size)).convert()
+        surface.fill(CRACK_COLORS[crack])
+        pygame.draw.rect(surface, (0,0,0), (0, 0, size, size), 2)
+        lines = self.crack_lines.setdefault(variant, [])
+        while len(lines) < crack:  # a new line per crack level, then it stays put
+            lines.append(tuple(self.rand.random() for _ in range(4)))
+        for sx, sy, ex, ey in lines[:crack]:
+            pygame.draw.line(surface, (0,0,0), (int(sx * size), int(sy * size)), (int(ex * size), int(ey * size)), 2)
+        return surface
+
+    def _draw_rocks(self, state, idx):
+        """Blit rocks idx (in index order, halos underneath) in one call; respects the screen clip."""
+        xs, ys, _, _, halo, cx, cy = state
+        sprites = self.sprites
+        keys = self._sprite_keys(state, idx)
+        for key in set(keys) - sprites.keys():
+            sprites[key] = self._make_sprite(key)
+        ring = idx[halo[idx]]
+        sequence = [(self.halo, (x - HALO_RADIUS, y - HALO_RADIUS))
+                    for x, y in zip(cx[ring].tolist(), cy[ring].tolist())]
+        sequence += zip([sprites[k] for k in keys], zip(xs[idx].tolist(), ys[idx].tolist()))
+        self.screen.blits(sequence, doreturn=False)
+
+    def _draw_people(self, sim, step_count):
+        rects = []
+        for px, py, escaped in zip(sim.people_x.tolist(), sim.people_y.tolist(), sim.people_escaped.tolist()):
+            if not escaped:
+                draw_person(self.screen, int(px), int(py), step_count)
+                rects.append(pygame.Rect(int(px) - 17, int(py) - 12, 34, 52))
+        dirty = rects + self.prev_people
+        self.prev_people = rects
+        return dirty
+
+    def _draw_overlays(self, sim):
+        rects = []
+        if sim.alert_display.any():
+            padding_x, padding_y = 20, 10
+            rect_w = self.alert_text.get_width() + 2*padding_x
+            rect_h = self.alert_text.get_height() + 2*padding_y
+            banner = pygame.Rect(WIDTH//2 - rect_w//2, 10, rect_w, rect_h)
+            pygame.draw.rect(self.screen, (255, 150, 150), banner, border_radius=12)
+            self.screen.blit(self.alert_text, (WIDTH//2 - self.alert_text.get_width()//2, banner.y + padding_y))
+            rects.append(banner)
+
+        if sim.life_saved:
+            self.life_saved_scale = min(self.life_saved_scale + 0.05, 1.0)
+            rect_w = int(280 * self.life_saved_scale)
+            rect_h = int(64 * self.life_saved_scale)
+            box = pygame.Rect(WIDTH//2 - rect_w//2, HEIGHT//2 - rect_h//2, rect_w, rect_h)
+            pygame.draw.rect(self.screen, (220, 255, 210), box, border_radius=22)
+            self.screen.blit(self.saved_text, (WIDTH//2 - self.saved_text.get_width()//2,
+                                               HEIGHT//2 - self.saved_text.get_height()//2))
+            rects.append(box.union(self.saved_text.get_rect(center=(WIDTH//2, HEIGHT//2))))
+
+        # overlays only need pushing when they appear, disappear or grow
+        dirty = [] if rects == self.prev_overlays else rects + self.prev_overlays
+        self.prev_overlays = rects
+        return dirty
+
+    def _lines_for(self, msg):
+        lines = self.report_lines.get(msg)
+        if lines is None:
+            if len(self.report_lines) >= REPORT_LINES_CACHE:
+                self.report_lines.pop(next(iter(self.report_lines)))  # drop the oldest message
+            lines = [self.font.render(line, True, (255,200,200)) for line in textwrap.wrap(msg, width=35)]
+            self.report_lines[msg] = lines
+        return lines
+
+    def _draw_sidebar(self, sim):
+        # reports are only ever appended, so the count tells whether the sidebar changed
+        if len(sim.warnings) == self.shown_reports:
+            return []
+        self.shown_reports = len(sim.warnings)
+        self.screen.blit(self.background, self.sidebar, self.sidebar)
+        y_offset = 60
+        for msg in sim.warnings[-self.max_reports:]:
+            for line in self._lines_for(msg):
+                self.screen.blit(line, (WIDTH + 20, y_offset))
+                y_offset += 26
+            y_offset += 10
+        return [self.sidebar]
+
+    # -------------------------
+    # Frame
+    # -------------------------
+    def draw(self, sim, step_count):
+        t0 = time.perf_counter()
+        rocks = self._rock_state(sim)
+        boxes = self._rock_boxes(rocks)
+        if self.prev_rocks is None:
+            changed = np.arange(sim.n)
+        else:
+            changed = np.zeros(sim.n, dtype=bool)
+            for now, before in zip(rocks, self.prev_rocks):
+                changed |= now != before
+            changed = np.flatnonzero(changed)
+        moved = [boxes[changed]]
+        if self.prev_boxes is not None:
+            moved.append(self.prev_boxes[changed])
+        moved += [np.array([[r.left, r.top, r.right, r.bottom] for r in self.prev_people + self.prev_overlays],
+                           dtype=boxes.dtype).reshape(-1, 4)]
+        tiles = self._dirty_tiles(np.concatenate(moved))
+        self.prev_rocks = rocks
+        self.prev_boxes = boxes
+
+        # rocks under a restored region are redrawn below in index order (clipped to it), so the
+        # result matches a full repaint; everything outside the restored regions is left as is
+        if self.full_frame:
+            self.screen.blit(self.background, (0, 0))
+            bands = [self.scene]
+        elif tiles.mean() > FULL_REPAINT_SHARE:
+            self.screen.blit(self.background, self.scene, self.scene)
+            bands = [self.scene]
+        else:
+            bands = self._bands(tiles)
+            self.screen.blits([(self.background, band, band) for band in bands], doreturn=False)
+        t1 = time.perf_counter()
+
+        for band in bands:
+            self.screen.set_clip(band)
+            if band is self.scene:
+                idx = np.arange(sim.n)
+            else:
+                idx = np.flatnonzero((boxes[:, 0] < band.right) & (boxes[:, 2] > band.left)
+                                     & (boxes[:, 1] < band.bottom) & (boxes[:, 3] > band.top))
+            self._draw_rocks(rocks, idx)
+        self.screen.set_clip(self.scene)
+        dirty = list(bands)
+        t2 = time.perf_counter()
+        dirty += self._draw_people(sim, step_count)
+        t3 = time.perf_counter()
+        dirty += self._draw_overlays(sim)
+        self.screen.set_clip(None)
+        t4 = time.perf_counter()
+        dirty += self._draw_sidebar(sim)
+        t5 = time.perf_counter()
+
+        if self.full_frame or self.full_redraw:
+            pygame.display.flip()
+            self.full_frame = False
+        elif dirty:
+            pygame.display.update([r.clip(self.screen.get_rect()) for r in dirty])
+        t6 = time.perf_counter()
+
+        for name, elapsed in zip(self.LAYERS, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4, t6 - t5)):
+            self.timings[name] += elapsed
+        self.frames += 1
+        return dirty
+
+    def report(self, reset=True):
+        """Mean milliseconds per frame for each layer since the last report."""
+        frames = max(self.frames, 1)
+        result = {name: total / frames * 1000 for name, total in self.timings.items()}
+        result["total"] = sum(result.values())
+        if reset:
+            self.timings = dict.fromkeys(self.LAYERS, 0.0)
+            self.frames = 0
+        return result
+
+
+def format_report(report):
+    return " | ".join(f"{name} {ms:.2f}" for name, ms in report.items()) + " (ms/frame)"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rockfall simulation demo.")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="dataset CSV in the merged_dataset.csv schema")
+    parser.add_argument("--low", type=int, default=DEFAULT_SAMPLE_COUNTS["Low"], help="Low-alert rocks to sample")
+    parser.add_argument("--medium", type=int, default=DEFAULT_SAMPLE_COUNTS["Medium"], help="Medium-alert rocks")
+    parser.add_argument("--high", type=int, default=DEFAULT_SAMPLE_COUNTS["High"], help="High-alert rocks")
+    parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible run")
+    parser.add_argument("--report-every", type=float, default=5.0, help="seconds between frame-time reports (0: off)")
+    parser.add_argument("--full-redraw", action="store_true", help="push the whole window every frame")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.data):
+        parser.error(f"dataset not found: {args.data}")
+
+    data = load_dataset(args.data, columns=SAMPLE_COLUMNS)
+    sim = build_sim(data, {"Low": args.low, "Medium": args.medium, "High": args.high}, seed=args.seed)
+    rand = random.Random(args.seed)  # cosmetic crack lines only
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH + SIDEBAR, HEIGHT))
+    pygame.display.set_caption("Rockfall Simulation - Hackathon Demo")
+    clock = pygame.time.Clock()
+
+    font = pygame.font.SysFont("Arial", 22)
+    big_font = pygame.font.SysFont("Arial", 44, bold=True)
+    renderer = LayeredRenderer(screen, font, big_font, rand, full_redraw=args.full_redraw)
+
+    step_count = 0
+    running = True
+    accumulator = 0.0
+    last_time = time.perf_counter()
+    last_report = last_time
+    while running:
+        step_count += 1
+        # physics runs on a fixed timestep, independent of how fast frames are drawn
+        now = time.perf_counter()
+        accumulator = min(accumulator + now - last_time, 0.25)  # avoid a spiral of death after a stall
+        last_time = now
+        while accumulator >= DT:
+            sim.step()
+            accumulator -= DT
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
+
+        renderer.draw(sim, step_count)
+        if args.report_every and now - last_report >= args.report_every:
+            print(format_report(renderer.report()))
+            last_report = now
+        clock.tick(30)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
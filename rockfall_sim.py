@@ -0,0 +1,242 @@
+import argparse
+import time
+
+import numpy as np
+
+# -------------------------
+# World constants (match rockfall_animation.py's window layout)
+# -------------------------
+WIDTH, HEIGHT = 1000, 600
+GROUND = HEIGHT - 70
+LEFT_MARGIN = 150
+PEAK_X = WIDTH // 2
+PEAK_Y = 80
+BASE_Y = 180
+WIDTH_FACTOR = 400
+HOUSES = [(200, HEIGHT - 170), (450, HEIGHT - 170), (700, HEIGHT - 170)]
+PEOPLE_PER_HOUSE = 3
+
+# the original animation advanced its physics once per frame at 30 fps;
+# every per-step constant below is expressed per fixed step of DT seconds
+STEPS_PER_SECOND = 30
+DT = 1.0 / STEPS_PER_SECOND
+CRACK_PROBABILITY = 0.001
+INITIAL_FALL_VELOCITY = 4.0
+GRAVITY = 0.4
+SHAKE_STEP = 1.5
+SHAKE_LIMIT = 6
+PERSON_SPEED = 5
+PEOPLE_DELAY_S = 1.0
+
+
+class RockfallSim:
+    """
+    Structure-of-arrays rockfall simulation: one NumPy array per rock attribute and per person
+    attribute, advanced by vectorized fixed-timestep steps. Rendering reads the arrays and never
+    mutates them.
+    """
+
+    def __init__(self, alerts, labels=None, seed=None):
+        """
+        alerts: per-rock alert level strings; labels: per-rock report text used when it lands
+        """
+        self.rng = np.random.default_rng(seed)
+        n = len(alerts)
+        self.n = n
+        self.alerts = np.asarray(alerts, dtype=object)
+        self.labels = np.asarray(labels if labels is not None else [""] * n, dtype=object)
+
+        x = self.rng.integers(PEAK_X - WIDTH_FACTOR, PEAK_X + WIDTH_FACTOR + 1, n)
+        # keep rocks out of the legend area
+        inside = x < LEFT_MARGIN
+        x[inside] = LEFT_MARGIN + self.rng.integers(0, WIDTH_FACTOR // 2 + 1, inside.sum())
+        curve_a = (BASE_Y - PEAK_Y) / (WIDTH_FACTOR ** 2)
+        self.x = x.astype(np.float64)
+        self.y = (PEAK_Y + (curve_a * (x - PEAK_X) ** 2).astype(np.int64)).astype(np.float64)
+        self.size = np.zeros(n, dtype=np.int16)  # pop-up animation towards target_size
+        self.target_size = self.rng.integers(30, 51, n).astype(np.int16)
+        self.crack_level = np.zeros(n, dtype=np.int8)
+        self.velocity = np.zeros(n)
+        self.shake_offset = np.zeros(n)
+        self.shake_dir = np.ones(n)
+        self.falling = np.zeros(n, dtype=bool)
+        self.paused = np.zeros(n, dtype=bool)
+        self.warned = np.zeros(n, dtype=bool)
+        self.alert_display = np.zeros(n, dtype=bool)
+        self.people_time = np.full(n, np.nan)
+
+        self.people_x = np.zeros(0)
+        self.people_y = np.zeros(0)
+        self.people_dir = np.zeros(0)
+        self.people_running = np.zeros(0, dtype=bool)
+        self.people_escaped = np.zeros(0, dtype=bool)
+
+        self.steps = 0
+        self.t = 0.0
+        self.warnings = []
+        self.life_saved = False
+        # summary statistics (sim seconds; None until the event happens)
+        self.first_alert_t = None
+        self.people_escaped_t = None
+        self.rocks_fallen = 0
+
+    # -------------------------
+    # Fixed-timestep update
+    # -------------------------
+    def step(self):
+        self.steps += 1
+        self.t = self.steps * DT
+        n = self.n
+
+        growing = self.size < self.target_size
+        self.size[growing] += 1
+
+        cracks = ~self.falling & (self.rng.random(n) < CRACK_PROBABILITY)
+        np.minimum(self.crack_level + cracks, 3, out=self.crack_level, casting="unsafe")
+
+        triggered = (self.crack_level == 3) & ~self.falling & ~self.warned
+        if triggered.any():
+            self.falling |= triggered
+            self.paused |= triggered
+            self.alert_display |= triggered
+            self.velocity[triggered] = INITIAL_FALL_VELOCITY
+            self.people_time[triggered] = self.t
+            if self.first_alert_t is None:
+                self.first_alert_t = self.t
+
+        shaking = self.paused
+        if shaking.any():
+            self.shake_offset[shaking] += self.shake_dir[shaking] * SHAKE_STEP
+            flip = shaking & (np.abs(self.shake_offset) > SHAKE_LIMIT)
+            self.shake_dir[flip] *= -1
+
+        moving = self.falling & ~self.paused
+        if moving.any():
+            self.velocity[moving] += GRAVITY
+            self.y[moving] += self.velocity[moving]
+            landed = moving & (self.y >= GROUND)
+            self.y[landed] = GROUND
+            self.falling[landed] = False
+            newly = landed & ~self.warned
+            if newly.any():
+                self.warned |= newly
+                self.alert_display[newly] = False
+                self.rocks_fallen += int(newly.sum())
+                self.warnings.extend(self.labels[newly])
+                self.life_saved = True
+
+        self._step_people()
+
+    def _step_people(self):
+        if self.alert_display.any():
+            waited = self.t - self.people_time >= PEOPLE_DELAY_S  # NaN (never alerted) compares False
+            if waited.any():
+                if len(self.people_x) == 0:
+                    self._spawn_people()
+                self.people_running[:] = True
+
+        if len(self.people_x) == 0:
+            return
+        moving = self.people_running & ~self.people_escaped
+        self.people_x[moving] += self.people_dir[moving] * PERSON_SPEED
+        self.people_escaped |= moving & ~((self.people_x > 0) & (self.people_x < WIDTH))
+        if self.people_escaped.all():
+            if self.people_escaped_t is None:
+                self.people_escaped_t = self.t
+            self.paused[:] = False
+
+    def _spawn_people(self):
+        hx = np.repeat([h[0] for h in HOUSES], PEOPLE_PER_HOUSE)
+        hy = np.repeat([h[1] for h in HOUSES], PEOPLE_PER_HOUSE)
+        j = np.tile(np.arange(PEOPLE_PER_HOUSE), len(HOUSES))
+        self.people_x = (hx + 40 + j * 10).astype(np.float64)
+        self.people_y = (hy + 60).astype(np.float64)
+        self.people_dir = self.rng.choice([-1.0, 1.0], size=len(hx))
+        self.people_running = np.zeros(len(hx), dtype=bool)
+        self.people_escaped = np.zeros(len(hx), dtype=bool)
+
+    def advance(self, seconds):
+        """Run as many fixed steps as fit in `seconds` (used by the real-time loop)."""
+        steps = int(seconds / DT)
+        for _ in range(steps):
+            self.step()
+        return steps
+
+    def summary(self):
+        return {
+            "rocks": self.n,
+            "steps": self.steps,
+            "sim_seconds": self.t,
+            "time_to_first_alert_s": self.first_alert_t,
+            "time_to_people_escaped_s": self.people_escaped_t,
+            "rocks_fallen": self.rocks_fallen,
+        }
+
+
+# -------------------------
+# Building a simulation from the dataset
+# -------------------------
+DEFAULT_DATA = "merged_dataset.csv"
+DEFAULT_SAMPLE_COUNTS = {"Low": 40, "Medium": 30, "High": 20}
+SAMPLE_COLUMNS = ["location_id", "region", "factor_of_safety", "alert_level"]
+
+
+def sample_rocks(data, counts=None, repeats=2, seed=None):
+    """
+    Draw rocks per alert level (with replacement, at most as many as the dataset has of that level)
+    and repeat the sample `repeats` times, as the original animation did.
+    Returns: (alerts, labels) arrays ready for RockfallSim
+    """
+    import pandas as pd
+
+    counts = DEFAULT_SAMPLE_COUNTS if counts is None else counts
+    rng = np.random.default_rng(seed)
+    parts = []
+    for level, count in counts.items():
+        subset = data[data["alert_level"] == level]
+        if len(subset) and count:
+            parts.append(subset.sample(min(count, len(subset)), replace=True, random_state=rng))
+    if not parts:
+        return np.array([], dtype=object), np.array([], dtype=object)
+    rows = pd.concat(parts * repeats, ignore_index=True)
+    labels = [
+        f"Rockfall at Location {r.location_id} | Region: {r.region} | FoS: {float(r.factor_of_safety):.2f}"
+        for r in rows.itertuples(index=False)
+    ]
+    return rows["alert_level"].astype(str).to_numpy(dtype=object), np.array(labels, dtype=object)
+
+
+def build_sim(data, counts=None, seed=None):
+    """Sample rocks and create the simulation from one seed (sampling and physics both derive from it)."""
+    sample_seed, sim_seed = np.random.SeedSequence(seed).spawn(2)
+    alerts, labels = sample_rocks(data, counts, seed=sample_seed)
+    return RockfallSim(alerts, labels, seed=sim_seed)
+
+
+# -------------------------
+# Headless benchmark
+# -------------------------
+def synthetic_alerts(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.choice(np.array(["Low", "Medium", "High"], dtype=object), size=n, p=[0.45, 0.33, 0.22])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmark of the rockfall simulation engine.")
+    parser.add_argument("--rocks", type=int, default=10_000)
+    parser.add_argument("--steps", type=int, default=3_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sim = RockfallSim(synthetic_alerts(args.rocks, args.seed), seed=args.seed)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        sim.step()
+    elapsed = time.perf_counter() - start
+    print(f"{args.rocks} rocks x {args.steps} steps in {elapsed:.2f}s "
+          f"({elapsed / args.steps * 1000:.3f} ms/step, {args.steps / elapsed:,.0f} steps/s)")
+    print(sim.summary())
+
+
+if __name__ == "__main__":
+    main()
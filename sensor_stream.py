@@ -0,0 +1,390 @@
+import argparse
+import csv
+import json
+import os
+import socket
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from risk_model import FEATURES, MODEL_PATH, NO_LEVEL, alert_level_codes, alert_level_names, load_fast_model, \
+    predict_scores
+
+# telemetry kept per location: the model inputs plus displacement, which is tracked but not scored
+STATE_COLUMNS = FEATURES + ["displacement_mm", "displacement_rate_mm_day"]
+TIMESTAMP_FIELDS = ("timestamp", "ts")
+DEFAULT_CAPACITY = 100_000
+UNSCORED = NO_LEVEL
+
+
+# -------------------------
+# Per-location state
+# -------------------------
+class LocationStore:
+    """
+    Latest telemetry per location_id in preallocated arrays (one row per location).
+    Rows grow by doubling up to `capacity`; past that the least recently updated location is
+    evicted, so memory stays bounded however many ids the stream produces.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, columns=STATE_COLUMNS, initial_rows=1024):
+        self.capacity = capacity
+        self.columns = list(columns)
+        self.column_index = {c: j for j, c in enumerate(self.columns)}
+        self.feature_cols = [self.column_index[c] for c in FEATURES]
+        self.slots = {}  # location_id -> row
+        self.n = 0
+        self._allocate(min(initial_rows, capacity))
+
+    def _allocate(self, rows):
+        fresh = {
+            "values": np.full((rows, len(self.columns)), np.nan),
+            "ids": np.empty(rows, dtype=object),
+            "score": np.full(rows, np.nan),
+            "level": np.full(rows, UNSCORED, dtype=np.int8),
+            "updated": np.zeros(rows),
+        }
+        for name, array in fresh.items():
+            if hasattr(self, name):
+                array[:self.n] = getattr(self, name)[:self.n]
+            setattr(self, name, array)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.values, self.ids, self.score, self.level, self.updated))
+
+    def _free_rows(self, k, protect):
+        """k rows for new ids: unused rows first, then the least recently updated (not in `protect`)."""
+        if self.n + k > len(self.ids) and len(self.ids) < self.capacity:
+            size = len(self.ids)
+            while size < self.n + k and size < self.capacity:
+                size *= 2
+            self._allocate(min(size, self.capacity))
+        take = min(k, len(self.ids) - self.n)
+        rows = list(range(self.n, self.n + take))
+        self.n += take
+        if take < k:
+            assert k - take <= self.n - len(protect) - take, "batch has more locations than capacity"
+            age = self.updated[:self.n].copy()
+            age[list(protect)] = np.inf
+            age[rows] = np.inf  # rows just taken from the free pool already belong to this batch
+            oldest = np.argpartition(age, k - take - 1)[:k - take]
+            for slot in oldest.tolist():
+                del self.slots[self.ids[slot]]
+                self.values[slot] = np.nan
+                self.score[slot] = np.nan
+                self.level[slot] = UNSCORED
+            rows.extend(oldest.tolist())
+        return rows
+
+    def rows_for(self, ids, now):
+        """Row index per id, allocating (or evicting) rows for new ids."""
+        slots = self.slots
+        new_ids = list(dict.fromkeys(i for i in ids if i not in slots))
+        if new_ids:
+            protect = {slots[i] for i in ids if i in slots}
+            if len(new_ids) + len(protect) > self.capacity:
+                raise ValueError(f"{len(new_ids) + len(protect)} locations in one batch exceeds capacity "
+                                 f"{self.capacity}")
+            for location_id, slot in zip(new_ids, self._free_rows(len(new_ids), protect)):
+                slots[location_id] = slot
+                self.ids[slot] = location_id
+        rows = np.fromiter((slots[i] for i in ids), dtype=np.int64, count=len(ids))
+        self.updated[rows] = now
+        return rows
+
+    def update(self, ids, columns, now):
+        """
+        ids: location ids; columns: {column: float array aligned with ids, NaN = not reported}.
+        Later records for the same id win. Returns: rows whose model inputs changed.
+        """
+        rows = self.rows_for(ids, now)
+        unique = np.unique(rows)
+        before = self.values[np.ix_(unique, self.feature_cols)].copy()
+        for column, values in columns.items():
+            j = self.column_index.get(column)
+            if j is None:
+                continue
+            reported = ~np.isnan(values)
+            self.values[rows[reported], j] = values[reported]
+        after = self.values[np.ix_(unique, self.feature_cols)]
+        changed = ~((before == after) | (np.isnan(before) & np.isnan(after))).all(axis=1)
+        return unique[changed]
+
+    def frame(self):
+        import pandas as pd
+
+        out = pd.DataFrame(self.values[:self.n], columns=self.columns)
+        out.insert(0, "location_id", self.ids[:self.n])
+        out["risk_score"] = self.score[:self.n]
+        out["alert_level"] = alert_level_names(self.level[:self.n])
+        return out
+
+
+# -------------------------
+# Scoring + transitions
+# -------------------------
+class StreamScorer:
+    """Applies record batches to a LocationStore, re-scores changed rows and yields alert transitions."""
+
+    def __init__(self, model, store=None):
+        self.model = model
+        self.store = store if store is not None else LocationStore()
+        self.records = 0
+        self.events = 0
+        self.rescored = 0
+        self.last_lag_s = None
+        self.started = time.perf_counter()
+
+    def seed(self, ids, columns):
+        """Bulk-load baseline state (e.g. merged_dataset.csv) without emitting events."""
+        rows = self.store.update(ids, columns, time.monotonic())
+        self._score(rows)
+
+    def _score(self, rows):
+        store = self.store
+        X = store.values[np.ix_(rows, store.feature_cols)]
+        complete = ~np.isnan(X).any(axis=1)
+        rows, X = rows[complete], X[complete]
+        scores = predict_scores(self.model, X)
+        codes = alert_level_codes(scores)
+        previous = store.level[rows].copy()
+        store.score[rows] = scores
+        store.level[rows] = codes
+        self.rescored += len(rows)
+        return rows, previous, codes, scores
+
+    def process(self, batch):
+        """
+        batch: RecordBatch. Returns: list of transition events
+        (location_id, from, to, risk_score; from is None the first time a location is scored).
+        """
+        now = time.time()
+        rows = self.store.update(batch.ids, batch.columns, time.monotonic())
+        rows, previous, codes, scores = self._score(rows)
+        moved = np.flatnonzero(previous != codes)
+        previous_names = alert_level_names(previous)
+        names = alert_level_names(codes)
+        events = [{
+            "location_id": self.store.ids[rows[k]],
+            "from": previous_names[k],
+            "to": names[k],
+            "risk_score": float(scores[k]),
+            "time": now,
+        } for k in moved]
+        self.records += len(batch.ids)
+        self.events += len(events)
+        if batch.timestamps is not None and np.isfinite(batch.timestamps).any():
+            self.last_lag_s = float(now - np.nanmin(batch.timestamps))
+        return events
+
+    def metrics(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "locations": len(self.store),
+            "records": self.records,
+            "records_per_s": self.records / elapsed,
+            "events": self.events,
+            "events_per_s": self.events / elapsed,
+            "rescored": self.rescored,
+            "ingest_lag_s": self.last_lag_s,
+            "state_bytes": self.store.nbytes,
+        }
+
+
+# -------------------------
+# Sources and parsing
+# -------------------------
+class RecordBatch:
+    """Columnar view of parsed records: ids, {column: float array}, optional event timestamps."""
+
+    def __init__(self, ids, columns, timestamps=None):
+        self.ids = ids
+        self.columns = columns
+        self.timestamps = timestamps
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_epoch(value):
+    f = _to_float(value)
+    if not np.isnan(f) or value in (None, ""):
+        return f
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return np.nan
+
+
+def to_batch(records, columns=STATE_COLUMNS):
+    """records: iterable of dicts with location_id and any subset of the state columns."""
+    records = [r for r in records if r.get("location_id")]
+    ids = [r["location_id"] for r in records]
+    values = {c: np.array([_to_float(r.get(c)) for r in records], dtype=np.float64) for c in columns}
+    ts_field = next((f for f in TIMESTAMP_FIELDS if records and f in records[0]), None)
+    timestamps = np.array([_to_epoch(r.get(ts_field)) for r in records]) if ts_field else None
+    return RecordBatch(ids, values, timestamps)
+
+
+class LineParser:
+    """CSV (header taken from the first line) or JSONL lines -> dict records."""
+
+    def __init__(self, fmt):
+        self.fmt = fmt
+        self.header = None
+
+    def parse(self, lines):
+        if self.fmt == "jsonl":
+            out = []
+            for line in lines:
+                line = line.strip()
+                if line:
+                    try:
+                        out.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        print(f"skipping malformed line: {line[:80]}", file=sys.stderr)
+            return out
+        rows = list(csv.reader(lines))
+        if self.header is None and rows:
+            self.header, rows = rows[0], rows[1:]
+        return [dict(zip(self.header, row)) for row in rows if row]
+
+
+def tail_lines(path, follow=True, poll_s=0.2, max_lines=10_000, from_end=False, keep_header=False):
+    """
+    Yield lists of complete lines appended to `path` (a partial last line waits for its newline).
+    With follow=False it stops at the current end of the file. With from_end and keep_header
+    (CSV input) the first line is still yielded before skipping to the end, so the parser
+    gets its header.
+    """
+    with open(path, "r", newline="") as f:
+        if from_end:
+            header = f.readline() if keep_header else ""
+            if keep_header and not header.endswith("\n"):
+                f.seek(0)  # no complete header yet: read it when it arrives
+            else:
+                f.seek(0, os.SEEK_END)
+                if header:
+                    yield [header]
+        pending = ""
+        while True:
+            chunk = f.readlines(max_lines * 256)
+            if chunk:
+                if pending:
+                    chunk[0] = pending + chunk[0]
+                    pending = ""
+                if not chunk[-1].endswith("\n"):
+                    pending = chunk.pop()
+                if chunk:
+                    yield chunk
+                continue
+            if not follow:
+                if pending:
+                    yield [pending]
+                return
+            time.sleep(poll_s)
+
+
+def socket_lines(address, max_lines=10_000, flush_s=0.2):
+    """
+    Newline-delimited records from a TCP socket ("host:port"), a stand-in for a message bus.
+    Buffered lines are handed off once max_lines arrive or flush_s has passed, so a
+    low-rate feed is not held back.
+    """
+    host, port = address.rsplit(":", 1)
+    with socket.create_connection((host, int(port))) as sock:
+        sock.settimeout(flush_s)
+        pending = b""
+        batch = []
+        last_flush = time.monotonic()
+        while True:
+            try:
+                data = sock.recv(1 << 16)
+            except socket.timeout:
+                data = None
+            if data == b"":  # peer closed
+                break
+            if data:
+                *lines, pending = (pending + data).split(b"\n")
+                batch.extend(line.decode() + "\n" for line in lines)
+            if batch and (len(batch) >= max_lines or time.monotonic() - last_flush >= flush_s):
+                yield batch
+                batch = []
+                last_flush = time.monotonic()
+            elif not batch:
+                last_flush = time.monotonic()
+        if pending:
+            batch.append(pending.decode())
+        if batch:
+            yield batch
+
+
+def seed_columns(path):
+    """
+    Baseline per-location state from a dataset CSV in the merged_dataset.csv schema.
+    Parsed as float64 the way LineParser parses live values (not from the float32 columnar
+    cache), so replaying an unchanged row compares equal and is not re-scored.
+    """
+    import pandas as pd
+
+    data = pd.read_csv(path, usecols=["location_id"] + STATE_COLUMNS, float_precision="round_trip",
+                       dtype={"location_id": str, **{c: np.float64 for c in STATE_COLUMNS}})
+    ids = data["location_id"].tolist()
+    return ids, {c: data[c].to_numpy() for c in STATE_COLUMNS}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest live telemetry and emit alert-level transitions.")
+    parser.add_argument("source", help="append-only .csv/.jsonl file, or host:port with --socket")
+    parser.add_argument("--socket", action="store_true", help="read newline-delimited records from a TCP socket")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None, help="default: from the extension")
+    parser.add_argument("--seed-from", default=None, help="dataset CSV with the baseline state per location")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="maximum locations held")
+    parser.add_argument("--events", default="-", help="JSONL file for transition events (default: stdout)")
+    parser.add_argument("--no-follow", action="store_true", help="stop at the end of the file")
+    parser.add_argument("--from-end", action="store_true", help="skip what is already in the file")
+    parser.add_argument("--stats-every", type=float, default=5.0, help="seconds between metric lines on stderr")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.source.endswith((".jsonl", ".ndjson")) or args.socket else "csv")
+    scorer = StreamScorer(load_fast_model(args.model), LocationStore(args.capacity))
+    if args.seed_from:
+        scorer.seed(*seed_columns(args.seed_from))
+    line_parser = LineParser(fmt)
+    if args.socket:
+        source = socket_lines(args.source)
+    else:
+        source = tail_lines(args.source, follow=not args.no_follow, from_end=args.from_end,
+                            keep_header=fmt == "csv")
+
+    out = sys.stdout if args.events == "-" else open(args.events, "a")
+    last_stats = time.perf_counter()
+    try:
+        for lines in source:
+            for event in scorer.process(to_batch(line_parser.parse(lines))):
+                out.write(json.dumps(event) + "\n")
+            out.flush()
+            if args.stats_every and time.perf_counter() - last_stats >= args.stats_every:
+                print(json.dumps(scorer.metrics()), file=sys.stderr)
+                last_stats = time.perf_counter()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        print(json.dumps(scorer.metrics()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
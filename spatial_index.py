@@ -0,0 +1,174 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import cache_dir_for, load_dataset, source_signature
+
+EARTH_RADIUS_KM = 6371.0088
+INDEX_COLUMNS = ["location_id", "region", "latitude", "longitude", "alert_level", "risk_score"]
+INDEX_FILE = "spatial_index.joblib"
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Vectorized great-circle distance in km (inputs in degrees)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# -------------------------
+# Spatial index over slope locations
+# -------------------------
+class SlopeIndex:
+    """
+    BallTree (haversine metric) over slope coordinates for radius and k-nearest queries,
+    plus a latitude-sorted array for bounding-box queries.
+    All queries accept optional alert_level / region filters (a value or a list of values).
+    """
+
+    def __init__(self, frame, tree=None):
+        from sklearn.neighbors import BallTree
+
+        missing = [c for c in ("latitude", "longitude") if c not in frame.columns]
+        if missing:
+            raise ValueError(f"Missing coordinate columns: {', '.join(missing)}")
+        self.frame = frame.reset_index(drop=True)
+        lat = self.frame["latitude"].to_numpy(dtype=np.float64)
+        lon = self.frame["longitude"].to_numpy(dtype=np.float64)
+        if tree is None:
+            tree = BallTree(np.radians(np.column_stack([lat, lon])), metric="haversine")
+        self.tree = tree
+        self.lat_order = np.argsort(lat, kind="stable")
+        self.lat_sorted = lat[self.lat_order]
+        self.lon = lon
+        # filter columns as integer codes, so a filter never materializes a full object column
+        self.filter_codes = {}
+        for column in ("alert_level", "region"):
+            if column in self.frame.columns:
+                cat = pd.Categorical(self.frame[column])
+                self.filter_codes[column] = (cat.codes, list(cat.categories))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _filter_mask(self, idx, alert_level=None, region=None):
+        mask = np.ones(len(idx), dtype=bool)
+        for column, wanted in (("alert_level", alert_level), ("region", region)):
+            if wanted is None:
+                continue
+            wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+            codes, categories = self.filter_codes[column]
+            wanted_codes = [categories.index(w) for w in wanted if w in categories]
+            mask &= np.isin(codes[idx], wanted_codes)
+        return mask
+
+    def _result(self, idx, distances_km=None):
+        out = self.frame.iloc[idx].copy()
+        if distances_km is not None:
+            out.insert(0, "distance_km", distances_km)
+        return out
+
+    def within_radius(self, lat, lon, radius_km, alert_level=None, region=None):
+        """Slopes within radius_km of (lat, lon), nearest first."""
+        idx, dist = self.tree.query_radius(np.radians([[lat, lon]]), r=radius_km / EARTH_RADIUS_KM,
+                                           return_distance=True, sort_results=True)
+        idx, dist = idx[0], dist[0] * EARTH_RADIUS_KM
+        keep = self._filter_mask(idx, alert_level, region)
+        return self._result(idx[keep], dist[keep])
+
+    def nearest(self, lat, lon, k=10, alert_level=None, region=None):
+        """The k slopes nearest to (lat, lon) that pass the filters."""
+        point = np.radians([[lat, lon]])
+        want = min(k, len(self))
+        while True:
+            dist, idx = self.tree.query(point, k=want, sort_results=True)
+            idx, dist = idx[0], dist[0] * EARTH_RADIUS_KM
+            keep = self._filter_mask(idx, alert_level, region)
+            if keep.sum() >= k or want == len(self):
+                return self._result(idx[keep][:k], dist[keep][:k])
+            want = min(want * 4, len(self))
+
+    def in_bbox(self, min_lat, min_lon, max_lat, max_lon, alert_level=None, region=None):
+        """Slopes inside a lat/long box; min_lon > max_lon means the box crosses the antimeridian."""
+        lo = np.searchsorted(self.lat_sorted, min_lat, side="left")
+        hi = np.searchsorted(self.lat_sorted, max_lat, side="right")
+        idx = self.lat_order[lo:hi]
+        lon = self.lon[idx]
+        if min_lon <= max_lon:
+            in_lon = (lon >= min_lon) & (lon <= max_lon)
+        else:
+            in_lon = (lon >= min_lon) | (lon <= max_lon)
+        idx = np.sort(idx[in_lon])
+        return self._result(idx[self._filter_mask(idx, alert_level, region)])
+
+    # -------------------------
+    # Persistence next to the data
+    # -------------------------
+    def save(self, path, signature=None):
+        import joblib
+
+        # plain data only, so the file does not depend on where this module was imported from
+        joblib.dump({"signature": signature, "frame": self.frame, "tree": self.tree}, path)
+
+    @staticmethod
+    def load(path, signature=None):
+        """Returns the stored index, or None if it was built from a different source."""
+        import joblib
+
+        try:
+            stored = joblib.load(path)
+        except (OSError, EOFError, ValueError, AttributeError):
+            return None
+        if not isinstance(stored, dict) or "tree" not in stored:
+            return None
+        if signature is not None and stored.get("signature") != signature:
+            return None
+        return SlopeIndex(stored["frame"], tree=stored["tree"])
+
+
+def load_or_build(csv_path="merged_dataset.csv", cache_root=None):
+    """
+    Load the persisted index for csv_path, rebuilding it when the CSV has changed.
+    The index file lives in the dataset's columnar cache directory.
+    """
+    path = os.path.join(cache_dir_for(csv_path, cache_root), INDEX_FILE)
+    signature = source_signature(csv_path)
+    index = SlopeIndex.load(path, signature) if os.path.exists(path) else None
+    if index is None:
+        header = pd.read_csv(csv_path, nrows=0).columns
+        frame = load_dataset(csv_path, columns=[c for c in INDEX_COLUMNS if c in header],
+                             cache_root=cache_root, mmap=False)
+        index = SlopeIndex(frame)
+        index.save(path, signature)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regional risk queries over slope locations.")
+    parser.add_argument("lat", type=float)
+    parser.add_argument("lon", type=float)
+    parser.add_argument("--data", default="merged_dataset.csv")
+    parser.add_argument("--radius-km", type=float, default=None, help="radius query (default: k-nearest)")
+    parser.add_argument("-k", type=int, default=10, help="neighbours for the k-nearest query")
+    parser.add_argument("--alert-level", action="append", help="filter, may be repeated")
+    parser.add_argument("--region", action="append", help="filter, may be repeated")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = load_or_build(args.data)
+    loaded = time.perf_counter() - start
+    start = time.perf_counter()
+    if args.radius_km is not None:
+        result = index.within_radius(args.lat, args.lon, args.radius_km, args.alert_level, args.region)
+    else:
+        result = index.nearest(args.lat, args.lon, args.k, args.alert_level, args.region)
+    queried = time.perf_counter() - start
+    print(result.to_string(index=False))
+    print(f"{len(result)} slopes (index load {loaded * 1000:.1f} ms, query {queried * 1000:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
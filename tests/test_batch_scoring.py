@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from batch_scoring import score_csv
+from risk_model import FEATURES, load_fast_model
+
+pytest.importorskip("pyarrow")
+
+
+def test_parquet_with_mixed_type_chunks(tmp_path):
+    src = tmp_path / "slopes.csv"
+    rows = pd.DataFrame({"site": ["1", "x", ""], **{c: [1.0, 2.0, 3.0] for c in FEATURES}})
+    rows.to_csv(src, index=False)
+    out = tmp_path / "scored.parquet"
+
+    n, _ = score_csv(load_fast_model(), str(src), str(out), chunk_rows=1)
+
+    scored = pd.read_parquet(out)
+    assert n == 3
+    assert scored["site"].tolist()[:2] == ["1", "x"] and pd.isna(scored["site"].iloc[2])
+    assert scored["alert_level_pred"].notna().all()
+    assert (scored[FEATURES].dtypes == "float64").all()
@@ -0,0 +1,58 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_store import build_cache, cache_dir_for, load_dataset
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "merged_dataset.csv")
+
+
+def test_concurrent_builders_share_one_cache(tmp_path):
+    csv = tmp_path / "sites.csv"
+    pd.read_csv(DATASET, nrows=2000).to_csv(csv, index=False)
+    builders = 4
+    barrier = threading.Barrier(builders)
+    errors = []
+
+    def build():
+        barrier.wait()
+        try:
+            for _ in range(5):
+                build_cache(str(csv))
+        except Exception as e:  # noqa: BLE001 - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=build) for _ in range(builders)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert sorted(os.listdir(tmp_path / ".georoots_cache")) == ["sites"]
+    cached = load_dataset(str(csv), columns=["latitude", "factor_of_safety"])
+    source = pd.read_csv(csv)
+    assert np.array_equal(cached["latitude"], source["latitude"])
+    assert np.allclose(cached["factor_of_safety"], source["factor_of_safety"], rtol=1e-6, equal_nan=True)
+
+
+def test_rebuild_replaces_stale_cache(tmp_path):
+    csv = tmp_path / "sites.csv"
+    pd.read_csv(DATASET, nrows=10).to_csv(csv, index=False)
+    build_cache(str(csv))
+    pd.read_csv(DATASET, nrows=20).to_csv(csv, index=False)
+    os.utime(csv, ns=(0, 0))
+    assert len(load_dataset(str(csv))) == 20
+    assert os.listdir(os.path.dirname(cache_dir_for(str(csv)))) == ["sites"]
+
+
+def test_forced_rebuild_replaces_fresh_cache(tmp_path):
+    csv = tmp_path / "sites.csv"
+    pd.read_csv(DATASET, nrows=10).to_csv(csv, index=False)
+    manifest = build_cache(str(csv))
+    column = os.path.join(cache_dir_for(str(csv)), manifest["columns"]["latitude"]["file"])
+    np.save(column, np.zeros(10))
+    build_cache(str(csv))
+    assert np.array_equal(load_dataset(str(csv), columns=["latitude"])["latitude"], pd.read_csv(csv)["latitude"])
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.linear_model import Ridge
+
+from online_ridge import RidgeStats, read_batch
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Final_Dataset.csv")
+ALPHA = 0.33
+
+
+@pytest.fixture(scope="module")
+def data():
+    return read_batch(DATASET)
+
+
+def folded(X, y, n_batches=7):
+    stats = RidgeStats(alpha=ALPHA)
+    splits = np.array_split(np.arange(len(y)), n_batches)
+    for i, idx in enumerate(splits):
+        stats.update(X[idx], y[idx], batch_id=f"b{i}")
+    return stats, splits
+
+
+def assert_matches_refit(stats, X, y):
+    coef, intercept = stats.solve()
+    ref = Ridge(alpha=ALPHA).fit(X, y)
+    assert np.allclose(coef, ref.coef_, rtol=1e-8, atol=1e-10)
+    assert np.allclose(intercept, ref.intercept_, rtol=1e-8, atol=1e-10)
+
+
+def test_incremental_matches_full_refit(data):
+    X, y = data
+    stats, _ = folded(X, y)
+    assert stats.n == len(y)
+    assert_matches_refit(stats, X, y)
+
+
+def test_rollback_matches_refit_without_batch(data):
+    X, y = data
+    stats, splits = folded(X, y)
+    assert stats.rollback("b3") == "b3"
+    keep = np.concatenate(splits[:3] + splits[4:])
+    assert_matches_refit(stats, X[keep], y[keep])
+
+    # re-applying it restores the full solution; rolling back the latest batch removes it again
+    stats.update(X[splits[3]], y[splits[3]], batch_id="b3")
+    assert_matches_refit(stats, X, y)
+    assert stats.rollback() == "b3"
+    assert_matches_refit(stats, X[keep], y[keep])
+
+
+def test_save_load_round_trip(data, tmp_path):
+    X, y = data
+    stats, splits = folded(X, y)
+    path = str(tmp_path / "stats.npz")
+    stats.save(path)
+    loaded = RidgeStats.load(path)
+    assert [b for b, _ in loaded.batches] == [b for b, _ in stats.batches]
+    assert loaded.sum_yy == pytest.approx(float(y @ y))
+    loaded.rollback("b0")
+    assert_matches_refit(loaded, X[np.concatenate(splits[1:])], y[np.concatenate(splits[1:])])
+
+
+def test_rollback_unknown_batch_lists_known_ids(data):
+    X, y = data
+    stats, _ = folded(X, y, n_batches=2)
+    with pytest.raises(ValueError, match="unknown batch 'nope'; known batches: 'b0', 'b1'"):
+        stats.rollback("nope")
+    assert [b for b, _ in stats.batches] == ["b0", "b1"]
@@ -0,0 +1,53 @@
+import os
+import random
+import time
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from rockfall_animation import SIDEBAR, LayeredRenderer  # noqa: E402
+from rockfall_sim import HEIGHT, STEPS_PER_SECOND, WIDTH, RockfallSim, synthetic_alerts  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode((WIDTH + SIDEBAR, HEIGHT))
+    pygame.quit()
+
+
+def renderer_for(surface):
+    font = pygame.font.Font(None, 22)
+    return LayeredRenderer(surface, font, pygame.font.Font(None, 44), random.Random(0))
+
+
+def test_partial_repaint_matches_full_repaint(screen):
+    sim = RockfallSim(synthetic_alerts(2_000), seed=1)
+    partial = renderer_for(screen)
+    full = renderer_for(pygame.Surface(screen.get_size()))
+    full.sprites, full.crack_lines = partial.sprites, partial.crack_lines  # same crack patterns
+    for frame in range(450):
+        sim.step()
+        partial.draw(sim, frame)
+        full.invalidate()
+        full.draw(sim, frame)
+        assert pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(full.screen, "RGB"), frame
+    assert sim.rocks_fallen and sim.first_alert_t is not None  # falling, shaking and halos were covered
+
+
+def test_frame_time_with_10k_rocks(screen):
+    sim = RockfallSim(synthetic_alerts(10_000), seed=0)
+    renderer = renderer_for(screen)
+    for frame in range(60):  # rocks pop up to full size: every frame is a full repaint
+        sim.step()
+        renderer.draw(sim, frame)
+    times = []
+    for frame in range(150):
+        sim.step()
+        start = time.perf_counter()
+        renderer.draw(sim, frame)
+        times.append(time.perf_counter() - start)
+    assert np.median(times) < 1 / STEPS_PER_SECOND
@@ -0,0 +1,39 @@
+import os
+
+import numpy as np
+import pytest
+
+from risk_model import load_fast_model
+from sensor_stream import LineParser, LocationStore, StreamScorer, seed_columns, to_batch
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "merged_dataset.csv")
+
+
+def test_batch_larger_than_capacity_is_rejected():
+    store = LocationStore(capacity=100, initial_rows=16)
+    store.rows_for([f"a{i}" for i in range(100)], now=1.0)
+    batch = [f"a{i}" for i in range(60)] + [f"b{i}" for i in range(50)]
+    with pytest.raises(ValueError):
+        store.rows_for(batch, now=2.0)
+    assert len(store) == 100 and set(store.slots) == {f"a{i}" for i in range(100)}
+
+
+def test_eviction_keeps_ids_in_the_batch():
+    store = LocationStore(capacity=100, initial_rows=16)
+    store.rows_for([f"a{i}" for i in range(100)], now=1.0)
+    batch = [f"a{i}" for i in range(60)] + [f"b{i}" for i in range(40)]
+    rows = store.rows_for(batch, now=2.0)
+    assert len(set(rows.tolist())) == 100
+    assert set(store.slots) == set(batch)
+
+
+def test_replaying_the_seed_file_rescored_nothing():
+    scorer = StreamScorer(load_fast_model(), LocationStore())
+    scorer.seed(*seed_columns(DATASET))
+    seeded = scorer.rescored
+    with open(DATASET, newline="") as f:
+        lines = f.readlines()
+    events = scorer.process(to_batch(LineParser("csv").parse(lines)))
+    assert scorer.rescored == seeded
+    assert events == []
+    assert np.isfinite(scorer.store.score[:len(scorer.store)]).any()
@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bulk_green_index import list_images
+from green_index import build_hsv_cube, open_image
+
+
+def parse_range(text):
+    """'35' -> [35]; '30:60:5' -> [30, 35, ..., 60] (inclusive)."""
+    parts = [int(p) for p in text.split(":")]
+    if len(parts) == 1:
+        return np.array(parts)
+    start, stop = parts[0], parts[1]
+    step = parts[2] if len(parts) > 2 else 1
+    return np.arange(start, stop + 1, step)
+
+
+def sweep(files, lower_h, upper_h, lower_s, lower_v, full_resolution=False):
+    """
+    Build one HSV cube per image, then evaluate every threshold combination with table lookups.
+    Returns: long DataFrame (file, lower_h, upper_h, lower_s, lower_v, green_percent)
+    """
+    grid = np.meshgrid(lower_h, upper_h, lower_s, lower_v, indexing="ij")
+    flat = [g.ravel() for g in grid]
+    frames = []
+    for path in files:
+        with open_image(path) as img:
+            cube = build_hsv_cube(img, full_resolution=full_resolution)
+        frames.append(pd.DataFrame({
+            "file": path,
+            "lower_h": flat[0], "upper_h": flat[1], "lower_s": flat[2], "lower_v": flat[3],
+            "green_percent": cube.green_percentage(*flat),
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Green percentage for a grid of HSV thresholds over many images.")
+    parser.add_argument("paths", nargs="+", help="image files and/or directories")
+    parser.add_argument("-o", "--output", default="threshold_sweep.csv")
+    parser.add_argument("--lower-h", default="35", help="value or start:stop[:step]")
+    parser.add_argument("--upper-h", default="85")
+    parser.add_argument("--lower-s", default="40")
+    parser.add_argument("--lower-v", default="40")
+    parser.add_argument("--full-resolution", action="store_true")
+    args = parser.parse_args(argv)
+
+    files = list_images(args.paths)
+    start = time.perf_counter()
+    result = sweep(files, parse_range(args.lower_h), parse_range(args.upper_h), parse_range(args.lower_s),
+                   parse_range(args.lower_v), full_resolution=args.full_resolution)
+    elapsed = time.perf_counter() - start
+    result.to_csv(args.output, index=False)
+    print(f"{len(files)} images x {len(result) // max(len(files), 1)} thresholds in {elapsed:.2f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from risk_model import FEATURES, MODEL_PATH
+
+DATASET_PATH = "Final_Dataset.csv"
+TARGET = "risk_score"
+ARTIFACT_FORMAT = 1
+
+# all training columns are bounded physical measurements; float32 keeps ~7 significant digits,
+# far more than the 2-decimal source data, and halves memory on large exports
+TRAIN_DTYPES = {c: np.float32 for c in FEATURES + [TARGET]}
+DEFAULT_ALPHAS = np.logspace(-3, 3, 20)
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+@contextmanager
+def timed(timings, stage):
+    start = time.perf_counter()
+    yield
+    timings[stage] = time.perf_counter() - start
+    print(f"  {stage:<10} {timings[stage]:8.3f}s")
+
+
+# -------------------------
+# Data loading
+# -------------------------
+def load_training_data(path=DATASET_PATH, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Stream the CSV in chunks, reading only the model columns with explicit float32 dtypes.
+    Returns: X (n,5) float32 in FEATURES order, y (n,) float32
+    """
+    X_parts, y_parts = [], []
+    for chunk in pd.read_csv(path, usecols=FEATURES + [TARGET], dtype=TRAIN_DTYPES, chunksize=chunk_rows):
+        chunk = chunk.dropna()
+        X_parts.append(chunk[FEATURES].to_numpy())
+        y_parts.append(chunk[TARGET].to_numpy())
+    if not X_parts:
+        raise ValueError(f"{path} has no rows")
+    return np.concatenate(X_parts), np.concatenate(y_parts)
+
+
+# -------------------------
+# Training
+# -------------------------
+def select_alpha(X, y, alphas=DEFAULT_ALPHAS, cv=5, n_jobs=-1):
+    """Cross-validate Ridge alpha, fitting folds x alphas in parallel. Returns (best_alpha, best_r2)."""
+    from sklearn.linear_model import Ridge
+    from sklearn.model_selection import GridSearchCV, KFold
+
+    search = GridSearchCV(
+        Ridge(),
+        {"alpha": list(alphas)},
+        cv=KFold(n_splits=cv, shuffle=True, random_state=42),
+        scoring="r2",
+        n_jobs=n_jobs,
+        refit=False,
+    )
+    search.fit(X, y)
+    return float(search.best_params_["alpha"]), float(search.best_score_)
+
+
+def train(dataset=DATASET_PATH, alpha=None, alphas=DEFAULT_ALPHAS, cv=5, n_jobs=-1, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Returns: artifact dict {"model": fitted Ridge, "metadata": {...}} ready for save_artifact
+    """
+    from sklearn.linear_model import Ridge
+
+    timings = {}
+    print(f"Training on {dataset}")
+    with timed(timings, "load"):
+        X, y = load_training_data(dataset, chunk_rows=chunk_rows)
+
+    cv_r2 = None
+    if alpha is None:
+        with timed(timings, "cv"):
+            alpha, cv_r2 = select_alpha(X, y, alphas=alphas, cv=cv, n_jobs=n_jobs)
+
+    with timed(timings, "fit"):
+        # fit on a DataFrame so the model records feature_names_in_ like the original pickle
+        model = Ridge(alpha=alpha).fit(pd.DataFrame(X, columns=FEATURES), y)
+
+    metadata = {
+        "format": ARTIFACT_FORMAT,
+        "version": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "model_type": type(model).__name__,
+        "alpha": alpha,
+        "cv_r2": cv_r2,
+        "features": list(FEATURES),
+        "target": TARGET,
+        "training_rows": int(len(y)),
+        "dataset": os.path.basename(dataset),
+        "timings_s": timings,
+        "fit_time_s": timings["fit"],
+    }
+    return {"model": model, "metadata": metadata}
+
+
+def save_artifact(artifact, path=MODEL_PATH, versions_dir="models"):
+    """
+    Write the artifact to path and a copy under versions_dir/<version>.pkl, plus a JSON sidecar
+    with the metadata and the compact model export next to each.
+    """
+    import joblib
+
+    from risk_model import export_compact
+
+    targets = [path]
+    if versions_dir:
+        os.makedirs(versions_dir, exist_ok=True)
+        targets.append(os.path.join(versions_dir, f"ridge_reg-{artifact['metadata']['version']}.pkl"))
+    for target in targets:
+        joblib.dump(artifact, target)
+        with open(os.path.splitext(target)[0] + ".json", "w") as f:
+            json.dump(artifact["metadata"], f, indent=2)
+        export_compact(target)
+    return targets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the ridge risk model from the training CSV.")
+    parser.add_argument("--data", default=DATASET_PATH, help="training CSV")
+    parser.add_argument("-o", "--output", default=MODEL_PATH, help="model artifact to write")
+    parser.add_argument("--versions-dir", default="models", help="where versioned copies go ('' to skip)")
+    parser.add_argument("--alpha", type=float, default=None, help="fixed alpha (skips cross-validation)")
+    parser.add_argument("--cv", type=int, default=5, help="cross-validation folds")
+    parser.add_argument("-j", "--n-jobs", type=int, default=-1, help="parallel CV jobs")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="CSV rows per chunk")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    artifact = train(args.data, alpha=args.alpha, cv=args.cv, n_jobs=args.n_jobs, chunk_rows=args.chunk_rows)
+    with timed({}, "save"):
+        paths = save_artifact(artifact, args.output, args.versions_dir)
+    meta = artifact["metadata"]
+    print(f"  {'total':<10} {time.perf_counter() - start:8.3f}s")
+    print(f"alpha={meta['alpha']:.4g} cv_r2={meta['cv_r2']} rows={meta['training_rows']} -> {', '.join(paths)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Content-addressed store for uploaded site images and what the app derived from them.
+
+Blobs (the uploaded bytes, the preview image and the green mask) live under
+objects/<2 hex>/<sha256><ext> and are written once, so identical uploads and identical
+masks are stored once. A SQLite index holds everything a lookup or the history view
+needs (green percentage, thresholds, mask shape, predictions, sizes, last use), so
+those never open a blob. Masks are bit-packed .npy files (8x smaller than the uint8
+mask) read with mmap. The least recently used blobs are evicted once the store grows
+past its size cap.
+"""
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from cache_paths import CACHE_DIR
+
+STORE_DIR = os.path.join(CACHE_DIR, "uploads")
+STORE_MAX_MB_ENV = "GEOROOTS_UPLOAD_STORE_MB"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_last_used ON blobs (last_used);
+CREATE TABLE IF NOT EXISTS images (
+    digest TEXT PRIMARY KEY,
+    name TEXT,
+    first_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    image_digest TEXT NOT NULL,
+    full_resolution INTEGER NOT NULL,
+    h_min INTEGER NOT NULL,
+    h_max INTEGER NOT NULL,
+    s_min INTEGER NOT NULL,
+    v_min INTEGER NOT NULL,
+    green_percent REAL NOT NULL,
+    mask_digest TEXT NOT NULL,
+    mask_height INTEGER NOT NULL,
+    mask_width INTEGER NOT NULL,
+    preview_digest TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (image_digest, full_resolution, h_min, h_max, s_min, v_min)
+);
+CREATE TABLE IF NOT EXISTS predictions (
+    image_digest TEXT NOT NULL,
+    full_resolution INTEGER NOT NULL,
+    h_min INTEGER NOT NULL,
+    h_max INTEGER NOT NULL,
+    s_min INTEGER NOT NULL,
+    v_min INTEGER NOT NULL,
+    slope_angle_deg REAL,
+    factor_of_safety REAL,
+    green_index REAL,
+    rainfall_mm_day REAL,
+    pore_pressure_kpa REAL,
+    model_sha256 TEXT,
+    risk_score REAL NOT NULL,
+    alert_level TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS predictions_image ON predictions (image_digest, created);
+"""
+
+_BLOB_EXT = {"image": ".img", "preview": ".npy", "mask": ".npy"}
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _npy_bytes(array):
+    buf = io.BytesIO()
+    np.save(buf, np.ascontiguousarray(array), allow_pickle=False)
+    return buf.getvalue()
+
+
+def pack_mask(mask):
+    """(h, w) boolean / 0-255 mask, or its RGB rendering -> (h, ceil(w/8)) uint8 bit rows."""
+    mask = np.asarray(mask)
+    if mask.ndim == 3:
+        mask = mask[..., 0]
+    return np.packbits(mask > 0, axis=1)
+
+
+def unpack_mask_rgb(packed, width):
+    """Bit rows back to the white-on-black RGB mask the app displays."""
+    gray = np.unpackbits(packed, axis=1, count=width)
+    gray *= 255
+    return np.repeat(gray[:, :, None], 3, axis=2)
+
+
+class StoredResult:
+    """Index row for one (image, thresholds) result; blobs are only opened on access."""
+
+    def __init__(self, store, row):
+        self.store = store
+        (self.image_digest, full_resolution, self.h_min, self.h_max, self.s_min, self.v_min, self.green_percent,
+         self.mask_digest, self.mask_height, self.mask_width, self.preview_digest, self.created,
+         self.last_used) = row
+        self.full_resolution = bool(full_resolution)
+
+    def mask_bits(self):
+        """Packed mask as a read-only memory map of the blob (no copy)."""
+        return self.store.read_array(self.mask_digest, "mask")
+
+    def mask_rgb(self):
+        return unpack_mask_rgb(self.mask_bits(), self.mask_width)
+
+    def preview_rgb(self):
+        return self.store.read_array(self.preview_digest, "preview")
+
+
+# -------------------------
+# Store
+# -------------------------
+class UploadStore:
+    """
+    Thread-safe (one connection behind a lock); several processes may share a
+    directory, SQLite serialises their index writes.
+    """
+
+    def __init__(self, root=STORE_DIR, max_bytes=None):
+        if max_bytes is None:
+            env = os.environ.get(STORE_MAX_MB_ENV)
+            max_bytes = int(float(env) * 1024 * 1024) if env else DEFAULT_MAX_BYTES
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite"), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def blob_path(self, digest, kind):
+        return os.path.join(self.root, "objects", digest[:2], digest + _BLOB_EXT[kind])
+
+    # ---- blobs
+    def _put_blob(self, data, kind, now, digest=None):
+        """Write data under its hash unless already present; returns the digest."""
+        digest = digest or sha256_bytes(data)
+        path = self.blob_path(digest, kind)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self._db.execute(
+            "INSERT INTO blobs (digest, kind, size, created, last_used) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(digest) DO UPDATE SET last_used = excluded.last_used",
+            (digest, kind, len(data), now, now))
+        return digest
+
+    def read_array(self, digest, kind):
+        return np.load(self.blob_path(digest, kind), mmap_mode="r")
+
+    def read_image(self, digest):
+        with open(self.blob_path(digest, "image"), "rb") as f:
+            return f.read()
+
+    # ---- results
+    def get(self, image_digest, full_resolution, h_min, h_max, s_min, v_min, touch=True):
+        """
+        Stored result for this image and thresholds, or None. Index only.
+        touch=False reads without marking it as used (browsing history must not affect eviction).
+        """
+        key = (image_digest, int(full_resolution), h_min, h_max, s_min, v_min)
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT * FROM results WHERE image_digest = ? AND full_resolution = ? AND h_min = ? AND h_max = ? "
+                "AND s_min = ? AND v_min = ?", key).fetchone()
+            if row is None or not touch:
+                return None if row is None else StoredResult(self, row)
+            self._db.execute(
+                "UPDATE results SET last_used = ? WHERE image_digest = ? AND full_resolution = ? AND h_min = ? "
+                "AND h_max = ? AND s_min = ? AND v_min = ?", (now,) + key)
+            self._db.execute("UPDATE blobs SET last_used = ? WHERE digest IN (?, ?, ?)",
+                             (now, image_digest, row[7], row[10]))
+        return StoredResult(self, row)
+
+    def put(self, image_bytes, full_resolution, h_min, h_max, s_min, v_min, green_percent, mask, preview_rgb,
+            name=None, image_digest=None):
+        """
+        Store an upload and one derived result. mask: (h, w) or RGB mask at preview size.
+        Returns: the StoredResult.
+        """
+        packed = pack_mask(mask)
+        mask_bytes = _npy_bytes(packed)
+        preview_bytes = _npy_bytes(preview_rgb)
+        now = time.time()
+        with self._lock, self._db:
+            image_digest = self._put_blob(image_bytes, "image", now, image_digest)
+            self._db.execute("INSERT OR IGNORE INTO images (digest, name, first_seen) VALUES (?, ?, ?)",
+                             (image_digest, name, now))
+            mask_digest = self._put_blob(mask_bytes, "mask", now)
+            preview_digest = self._put_blob(preview_bytes, "preview", now)
+            row = (image_digest, int(full_resolution), h_min, h_max, s_min, v_min, float(green_percent),
+                   mask_digest, packed.shape[0], np.asarray(mask).shape[1], preview_digest, now, now)
+            self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+            self._evict(protect={image_digest, mask_digest, preview_digest})
+        return StoredResult(self, row)
+
+    def record_prediction(self, image_digest, full_resolution, h_min, h_max, s_min, v_min, inputs, risk_score,
+                          alert_level, model_sha256=None):
+        """Append one prediction (inputs in FEATURES order) to the audit log; kept after eviction."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO predictions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (image_digest, int(full_resolution), h_min, h_max, s_min, v_min, *map(float, inputs),
+                 model_sha256, float(risk_score), str(alert_level), time.time()))
+
+    # ---- index-only queries
+    def history(self, limit=50):
+        """Most recently used results with their latest prediction, newest first."""
+        with self._lock:
+            # bare columns next to MAX() come from the row holding the maximum (SQLite)
+            cur = self._db.execute(
+                "SELECT r.image_digest, i.name, r.full_resolution, r.h_min, r.h_max, r.s_min, r.v_min, "
+                "r.green_percent, r.mask_height, r.mask_width, r.last_used, p.risk_score, p.alert_level "
+                "FROM results r LEFT JOIN images i ON i.digest = r.image_digest "
+                "LEFT JOIN (SELECT image_digest, full_resolution, h_min, h_max, s_min, v_min, risk_score, alert_level, "
+                "           MAX(created) FROM predictions "
+                "           GROUP BY image_digest, full_resolution, h_min, h_max, s_min, v_min) p "
+                "USING (image_digest, full_resolution, h_min, h_max, s_min, v_min) "
+                "ORDER BY r.last_used DESC LIMIT ?", (limit,))
+            names = [d[0] for d in cur.description]
+            return [dict(zip(names, row)) for row in cur.fetchall()]
+
+    def stats(self):
+        with self._lock:
+            by_kind = self._db.execute(
+                "SELECT kind, COUNT(*), COALESCE(SUM(size), 0) FROM blobs GROUP BY kind").fetchall()
+            results = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            predictions = self._db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        return {
+            "blobs": {kind: {"count": count, "bytes": size} for kind, count, size in by_kind},
+            "bytes": sum(size for _, _, size in by_kind),
+            "max_bytes": self.max_bytes,
+            "results": results,
+            "predictions": predictions,
+        }
+
+    # ---- eviction
+    def prune(self, max_bytes=None):
+        """Evict least recently used blobs until the store fits max_bytes; returns bytes freed."""
+        with self._lock, self._db:
+            return self._evict(max_bytes=max_bytes)
+
+    def _evict(self, protect=(), max_bytes=None):
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        freed = 0
+        if total <= limit:
+            return freed
+        for digest, kind, size in self._db.execute(
+                "SELECT digest, kind, size FROM blobs ORDER BY last_used").fetchall():
+            if total - freed <= limit:
+                break
+            if digest in protect:
+                continue
+            # results are unusable without any of their blobs, so they go with them
+            self._db.execute("DELETE FROM results WHERE image_digest = ? OR mask_digest = ? OR preview_digest = ?",
+                             (digest, digest, digest))
+            self._db.execute("DELETE FROM images WHERE digest = ?", (digest,))
+            self._db.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            try:
+                os.remove(self.blob_path(digest, kind))
+            except FileNotFoundError:
+                pass
+            freed += size
+        return freed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or prune the upload store.")
+    parser.add_argument("command", choices=["stats", "history", "prune"])
+    parser.add_argument("--root", default=STORE_DIR)
+    parser.add_argument("--max-mb", type=float, default=None, help=f"size cap (default: ${STORE_MAX_MB_ENV} or "
+                                                                   f"{DEFAULT_MAX_BYTES // 2 ** 20})")
+    parser.add_argument("--limit", type=int, default=20, help="history rows")
+    args = parser.parse_args(argv)
+
+    store = UploadStore(args.root, None if args.max_mb is None else int(args.max_mb * 1024 * 1024))
+    if args.command == "stats":
+        stats = store.stats()
+        print(f"{stats['bytes'] / 2 ** 20:.1f} / {stats['max_bytes'] / 2 ** 20:.0f} MB, "
+              f"{stats['results']} results, {stats['predictions']} predictions")
+        for kind, entry in sorted(stats["blobs"].items()):
+            print(f"  {kind:<8}{entry['count']:>7} blobs {entry['bytes'] / 2 ** 20:>10.1f} MB")
+    elif args.command == "history":
+        for row in store.history(args.limit):
+            score = "-" if row["risk_score"] is None else f"{row['risk_score']:.4f} {row['alert_level']}"
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(row['last_used']))}  "
+                  f"{row['image_digest'][:12]}  {row['name'] or '':<24.24} "
+                  f"H{row['h_min']}-{row['h_max']} S>={row['s_min']} V>={row['v_min']}  "
+                  f"green {row['green_percent']:6.2f}%  risk {score}")
+    else:
+        freed = store.prune()
+        print(f"freed {freed / 2 ** 20:.1f} MB; {store.stats()['bytes'] / 2 ** 20:.1f} MB in store")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()